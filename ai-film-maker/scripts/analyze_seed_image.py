@@ -3,9 +3,11 @@
 
 import os
 import sys
+import re
 import json
+import hashlib
 import shutil
-from typing import Optional
+from typing import List, Optional, TypedDict
 
 try:
     import google.generativeai as genai
@@ -15,52 +17,31 @@ except ImportError:
 
 from utils import (
     slugify, ensure_output_dirs, get_image_path,
-    save_scene_json, create_scene_json_template
+    save_scene_json, create_scene_json_template, retry,
+    write_json_atomic, hash_file, get_cache_dir, parse_json
 )
 
 
-def configure_gemini():
-    """Configure Gemini API"""
-    if not GOOGLE_AVAILABLE:
-        raise ImportError(
-            "google-generativeai package not installed. "
-            "Run: pip install google-generativeai"
-        )
-
-    api_key = os.environ.get("GOOGLE_AI_API_KEY") or os.environ.get("GEMINI_API_KEY")
-    if not api_key:
-        raise ValueError(
-            "GOOGLE_AI_API_KEY or GEMINI_API_KEY environment variable not set"
-        )
-
-    genai.configure(api_key=api_key)
-    return genai.GenerativeModel("gemini-2.0-flash")
+class SceneSpec(TypedDict):
+    """One scene of the generated story"""
+    scene_number: int
+    description: str
+    text_to_image_prompt: Optional[str]
+    image_to_video_prompt: str
+    has_main_character: bool
 
 
-def analyze_image_and_generate_story(
-    model,
-    image_path: str,
-    user_prompt: str
-) -> dict:
-    """
-    Analyze seed image and generate a story with scene prompts.
-
-    Args:
-        model: Gemini model instance
-        image_path: Path to the seed image
-        user_prompt: User's story direction/theme
-
-    Returns:
-        Dictionary with story, narration, and scene prompts
-    """
-    print(f"Analyzing seed image: {image_path}")
-    print(f"User prompt: {user_prompt}")
-    print("-" * 50)
+class StorySpec(TypedDict):
+    """Story returned by Gemini (used as the structured-output schema)"""
+    title: str
+    story_summary: str
+    narration: str
+    music_prompt: str
+    scenes: List[SceneSpec]
 
-    # Upload the image
-    image_file = genai.upload_file(path=image_path)
 
-    analysis_prompt = f"""You are a creative filmmaker. Analyze this image and create a compelling 30-second short film story.
+# Story prompt sent with the seed image; {user_prompt} is filled in per call
+ANALYSIS_PROMPT = """You are a creative filmmaker. Analyze this image and create a compelling 30-second short film story.
 
 User's direction: {user_prompt}
 
@@ -108,29 +89,220 @@ Text-to-image prompts should be detailed, mentioning style, lighting, compositio
 Image-to-video prompts should describe smooth, cinematic camera movements.
 """
 
+# Markdown code fence around a JSON payload (```json ... ```)
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.S)
+
+# Fields Gemini may leave out that have a sensible fallback
+STORY_DEFAULTS = {
+    "story_summary": "",
+    "music_prompt": "Cinematic orchestral soundtrack",
+}
+
+SCENE_DEFAULTS = {
+    "text_to_image_prompt": None,
+    "has_main_character": False,
+}
+
+STORY_FIELD_TYPES = {
+    "title": str,
+    "story_summary": str,
+    "narration": str,
+    "music_prompt": str,
+    "scenes": list,
+}
+
+SCENE_FIELD_TYPES = {
+    "scene_number": int,
+    "description": str,
+    "text_to_image_prompt": (str, type(None)),
+    "image_to_video_prompt": str,
+    "has_main_character": bool,
+}
+
+
+def check_fields(data: dict, field_types: dict, defaults: dict, where: str) -> List[str]:
+    """
+    Fill in defaults and type-check the fields of one object.
+
+    Returns:
+        List of problems found (empty if the object is valid)
+    """
+    errors = []
+    for field, expected in field_types.items():
+        if data.get(field) is None and field in defaults:
+            data[field] = defaults[field]
+        if field not in data:
+            errors.append(f"{where}: missing '{field}'")
+        elif not isinstance(data[field], expected):
+            errors.append(f"{where}: '{field}' has type {type(data[field]).__name__}")
+    return errors
+
+
+def parse_story_response(response_text: str):
+    """
+    Parse the JSON story from a Gemini response.
+
+    JSON mode returns bare JSON; the fenced-block search only runs if that
+    fails to parse (e.g. the model wrapped its answer in markdown anyway).
+    """
+    try:
+        return parse_json(response_text)
+    except json.JSONDecodeError:
+        match = _FENCE_RE.search(response_text)
+        if not match:
+            raise
+        return parse_json(match.group(1))
+
+
+def validate_story(story_data) -> StorySpec:
+    """
+    Validate the story returned by Gemini, filling in optional fields.
+
+    All problems are collected and reported together, so a bad response
+    fails here with a clear message instead of a KeyError further down.
+
+    Raises:
+        ValueError: If required fields are missing or have the wrong type
+    """
+    if not isinstance(story_data, dict):
+        raise ValueError(f"Story must be a JSON object, got {type(story_data).__name__}")
+
+    errors = check_fields(story_data, STORY_FIELD_TYPES, STORY_DEFAULTS, "story")
+
+    for i, scene in enumerate(story_data.get("scenes") or []):
+        if not isinstance(scene, dict):
+            errors.append(f"scenes[{i}]: must be an object")
+            continue
+        errors.extend(check_fields(scene, SCENE_FIELD_TYPES, SCENE_DEFAULTS, f"scenes[{i}]"))
+
+    if errors:
+        raise ValueError("Invalid story from Gemini:\n  " + "\n  ".join(errors))
+
+    return story_data
+
+
+def configure_gemini():
+    """Configure Gemini API"""
+    if not GOOGLE_AVAILABLE:
+        raise ImportError(
+            "google-generativeai package not installed. "
+            "Run: pip install google-generativeai"
+        )
+
+    api_key = os.environ.get("GOOGLE_AI_API_KEY") or os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        raise ValueError(
+            "GOOGLE_AI_API_KEY or GEMINI_API_KEY environment variable not set"
+        )
+
+    genai.configure(api_key=api_key)
+
+    # Structured output: Gemini returns bare JSON matching StorySpec
+    return genai.GenerativeModel(
+        "gemini-2.0-flash",
+        generation_config=genai.GenerationConfig(
+            response_mime_type="application/json",
+            response_schema=StorySpec
+        )
+    )
+
+
+def get_story_cache_path(cache_dir: str, image_digest: str, user_prompt: str) -> str:
+    """Get the cache file for a (seed image, prompt) pair"""
+    # The full prompt is hashed, so editing ANALYSIS_PROMPT invalidates old stories
+    key = hashlib.sha256(
+        f"{image_digest}\n{ANALYSIS_PROMPT.format(user_prompt=user_prompt)}".encode('utf-8')
+    ).hexdigest()
+    return os.path.join(cache_dir, 'gemini', f"{key}.json")
+
+
+def get_or_upload_image(image_path: str, image_digest: str, cache_dir: str):
+    """
+    Upload an image to the Gemini Files API, reusing an earlier upload.
+
+    Uploaded file names are recorded in gemini_files.json by image digest.
+    Gemini keeps files for 48 hours, so a lookup that fails or returns a file
+    that is not ACTIVE falls back to a fresh upload.
+
+    Returns:
+        Gemini File handle
+    """
+    registry_path = os.path.join(cache_dir, 'gemini_files.json')
+    registry = {}
+    if os.path.exists(registry_path):
+        with open(registry_path, 'r') as f:
+            registry = json.load(f)
+
+    file_name = registry.get(image_digest)
+    if file_name:
+        try:
+            image_file = genai.get_file(file_name)
+            if image_file.state.name == "ACTIVE":
+                print(f"Reusing uploaded image: {file_name}")
+                return image_file
+        except Exception as e:
+            print(f"Uploaded image {file_name} no longer available ({e})")
+
+    image_file = genai.upload_file(path=image_path)
+    registry[image_digest] = image_file.name
+    write_json_atomic(registry_path, registry)
+    return image_file
+
+
+@retry()
+def analyze_image_and_generate_story(
+    model,
+    image_path: str,
+    user_prompt: str,
+    cache_dir: Optional[str] = None
+) -> dict:
+    """
+    Analyze seed image and generate a story with scene prompts.
+
+    Args:
+        model: Gemini model instance
+        image_path: Path to the seed image
+        user_prompt: User's story direction/theme
+        cache_dir: Directory for cached stories (None disables caching)
+
+    Returns:
+        Dictionary with story, narration, and scene prompts
+    """
+    print(f"Analyzing seed image: {image_path}")
+    print(f"User prompt: {user_prompt}")
+    print("-" * 50)
+
+    # Reuse the story from an earlier run with the same image and prompt
+    cache_path = None
+    if cache_dir:
+        image_digest = hash_file(image_path)
+        cache_path = get_story_cache_path(cache_dir, image_digest, user_prompt)
+        if os.path.exists(cache_path):
+            print(f"Using cached story: {cache_path}")
+            with open(cache_path, 'r') as f:
+                return validate_story(json.load(f))
+
+        image_file = get_or_upload_image(image_path, image_digest, cache_dir)
+    else:
+        image_file = genai.upload_file(path=image_path)
+
+    analysis_prompt = ANALYSIS_PROMPT.format(user_prompt=user_prompt)
+
     print("Generating story with Gemini Vision...")
     response = model.generate_content([image_file, analysis_prompt])
 
-    # Parse JSON from response
     response_text = response.text
 
-    # Extract JSON from response (handle markdown code blocks)
-    if "```json" in response_text:
-        json_start = response_text.find("```json") + 7
-        json_end = response_text.find("```", json_start)
-        response_text = response_text[json_start:json_end].strip()
-    elif "```" in response_text:
-        json_start = response_text.find("```") + 3
-        json_end = response_text.find("```", json_start)
-        response_text = response_text[json_start:json_end].strip()
-
     try:
-        story_data = json.loads(response_text)
-    except json.JSONDecodeError as e:
+        story_data = validate_story(parse_story_response(response_text))
+    except (json.JSONDecodeError, ValueError) as e:
         print(f"Failed to parse JSON response: {e}")
         print(f"Raw response:\n{response_text}")
         raise
 
+    if cache_path:
+        write_json_atomic(cache_path, story_data)
+
     return story_data
 
 
@@ -179,7 +351,7 @@ def create_seed_scene_json(
         "config": {
             "voiceId": voice_id,
             "voiceSpeed": 1.0,
-            "musicPrompt": story_data.get("music_prompt", "Cinematic orchestral soundtrack"),
+            "musicPrompt": story_data["music_prompt"],
             "musicVolume": 0.2,
             "narrationVolume": 1.0
         },
@@ -204,9 +376,9 @@ def create_seed_scene_json(
         sub_scene = {
             "subSceneId": f"{scene_num}-1",
             "duration": 5,
-            "hasMainCharacter": scene_data.get("has_main_character", False),
+            "hasMainCharacter": scene_data["has_main_character"],
             "description": scene_data["description"],
-            "textToImagePrompt": scene_data.get("text_to_image_prompt"),
+            "textToImagePrompt": scene_data["text_to_image_prompt"],
             "imageToVideoPrompt": scene_data["image_to_video_prompt"]
         }
 
@@ -225,7 +397,7 @@ def create_seed_scene_json(
 
     # Save scene.json
     json_path = os.path.join(dirs['base'], "scene.json")
-    save_scene_json(json_path, scene_json)
+    save_scene_json(json_path, scene_json, pretty=True)
 
     print(f"\nScene JSON created: {json_path}")
     print(f"Title: {title}")
@@ -240,7 +412,8 @@ def process_seed_image(
     user_prompt: str,
     output_dir: str = "OUTPUT",
     quality_tier: str = "cheapest",
-    voice_id: str = "am_adam"
+    voice_id: str = "am_adam",
+    use_cache: bool = True
 ) -> str:
     """
     Main entry point for seed mode processing.
@@ -251,6 +424,7 @@ def process_seed_image(
         output_dir: Base output directory
         quality_tier: Quality tier for generation
         voice_id: Voice for narration
+        use_cache: Reuse a cached story for the same image and prompt
 
     Returns:
         Path to the created scene.json file
@@ -263,7 +437,10 @@ def process_seed_image(
     model = configure_gemini()
 
     # Analyze image and generate story
-    story_data = analyze_image_and_generate_story(model, seed_image_path, user_prompt)
+    cache_dir = get_cache_dir(output_dir) if use_cache else None
+    story_data = analyze_image_and_generate_story(
+        model, seed_image_path, user_prompt, cache_dir=cache_dir
+    )
 
     print("\n" + "=" * 50)
     print("Story Generated!")
@@ -297,45 +474,58 @@ def print_usage():
     print("  --output-dir  Output directory (default: OUTPUT)")
     print("  --tier        Quality tier: cheapest, balanced, highest (default: cheapest)")
     print("  --voice       Voice ID for narration (default: am_adam)")
+    print("  --no-cache    Always call Gemini, even for a previously analyzed image + prompt")
     print("\nExample:")
     print('  python analyze_seed_image.py photo.jpg "An epic adventure in nature"')
 
 
-if __name__ == "__main__":
-    if len(sys.argv) < 3:
+def main(argv: list) -> str:
+    """Run the analysis from command-line arguments, returning the scene.json path"""
+    if len(argv) < 2:
         print_usage()
         sys.exit(1)
 
-    seed_image = sys.argv[1]
-    prompt = sys.argv[2]
+    seed_image = argv[0]
+    prompt = argv[1]
 
     # Parse optional arguments
     output_dir = "OUTPUT"
     tier = "cheapest"
     voice = "am_adam"
+    use_cache = True
 
-    i = 3
-    while i < len(sys.argv):
-        if sys.argv[i] == "--output-dir" and i + 1 < len(sys.argv):
-            output_dir = sys.argv[i + 1]
+    i = 2
+    while i < len(argv):
+        if argv[i] == "--output-dir" and i + 1 < len(argv):
+            output_dir = argv[i + 1]
             i += 2
-        elif sys.argv[i] == "--tier" and i + 1 < len(sys.argv):
-            tier = sys.argv[i + 1]
+        elif argv[i] == "--tier" and i + 1 < len(argv):
+            tier = argv[i + 1]
             i += 2
-        elif sys.argv[i] == "--voice" and i + 1 < len(sys.argv):
-            voice = sys.argv[i + 1]
+        elif argv[i] == "--voice" and i + 1 < len(argv):
+            voice = argv[i + 1]
             i += 2
+        elif argv[i] == "--no-cache":
+            use_cache = False
+            i += 1
         else:
             i += 1
 
-    json_path = process_seed_image(seed_image, prompt, output_dir, tier, voice)
+    json_path = process_seed_image(seed_image, prompt, output_dir, tier, voice, use_cache)
 
     print("\n" + "=" * 50)
     print("Seed image analysis complete!")
     print(f"Scene JSON: {json_path}")
+    return json_path
+
+
+if __name__ == "__main__":
+    json_path = main(sys.argv[1:])
+
     print("\nNext steps:")
     print(f"  1. python generate_images.py {json_path}")
     print(f"  2. python generate_videos.py {json_path}")
     print(f"  3. python generate_narration.py {json_path}")
     print(f"  4. python generate_music.py {json_path}")
     print(f"  5. python compose_video.py {json_path}")
+    print(f"\nOr all at once: python film.py pipeline {json_path}")
@@ -1,13 +1,17 @@
 #!/usr/bin/env python3
-"""Compose final video by concatenating clips and mixing audio"""
+"""Compose final video by concatenating clips and mixing audio in one ffmpeg pass"""
 
 import os
 import sys
+import json
+import functools
 import subprocess
 import tempfile
+from typing import Optional
 from utils import (
     load_scene_json, save_scene_json,
-    get_output_dirs, get_final_video_path
+    get_output_dirs, get_final_video_path,
+    run_ffmpeg, get_ffmpeg_log_path
 )
 
 def get_video_clips(data: dict) -> list:
@@ -20,66 +24,163 @@ def get_video_clips(data: dict) -> list:
                 clips.append(video_path)
     return clips
 
-def concatenate_videos(video_paths: list, output_path: str) -> None:
-    """Concatenate video clips using ffmpeg"""
-    print(f"Concatenating {len(video_paths)} video clips...")
+# Stream parameters that must match for clips to be joined without re-encoding
+STREAM_COPY_KEYS = (
+    'codec_name', 'profile', 'width', 'height', 'pix_fmt', 'r_frame_rate', 'time_base'
+)
 
-    # Create concat file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-        for path in video_paths:
-            f.write(f"file '{path}'\n")
-        concat_file = f.name
+def probe_video_stream(path: str) -> tuple:
+    """Get the parameters of a clip's first video stream using ffprobe"""
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=' + ','.join(STREAM_COPY_KEYS),
+        '-of', 'json',
+        path
+    ]
+    result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    streams = json.loads(result.stdout).get('streams') or [{}]
+    return tuple(streams[0].get(key) for key in STREAM_COPY_KEYS)
 
+def can_stream_copy(video_paths: list) -> bool:
+    """Check whether all clips share codec parameters so concat can skip re-encoding"""
     try:
-        cmd = [
-            'ffmpeg', '-y',
-            '-f', 'concat',
-            '-safe', '0',
-            '-i', concat_file,
-            '-c:v', 'libx264',
-            '-preset', 'fast',
-            '-crf', '18',
-            output_path
-        ]
-        subprocess.run(cmd, check=True, capture_output=True)
-    finally:
-        os.unlink(concat_file)
+        params = {probe_video_stream(path) for path in video_paths}
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return False
+    return len(params) == 1 and None not in next(iter(params))
+
+# Software H.264 encoder used when no hardware encoder is available
+SOFTWARE_ENCODER_ARGS = ['-c:v', 'libx264', '-preset', 'fast', '-crf', '18']
+
+# Hardware H.264 encoders (FILM_HWENC name -> ffmpeg encoder, quality args),
+# in the order they are tried for FILM_HWENC=auto
+HARDWARE_ENCODERS = {
+    'nvenc': ('h264_nvenc', ['-preset', 'p4', '-cq', '19']),
+    'vt': ('h264_videotoolbox', ['-q:v', '50']),
+    'qsv': ('h264_qsv', ['-global_quality', '19']),
+}
+
+@functools.lru_cache(maxsize=None)
+def get_ffmpeg_encoders() -> frozenset:
+    """List the encoders compiled into the local ffmpeg"""
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-encoders'],
+            check=True, capture_output=True, text=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return frozenset()
 
-def compose_final_video(
-    video_path: str,
-    narration_path: str,
-    music_path: str,
+    return frozenset(
+        fields[1] for fields in (line.split() for line in result.stdout.splitlines())
+        if len(fields) > 1
+    )
+
+def select_encoder_args() -> list:
+    """
+    Choose H.264 encoder arguments for re-encoding.
+
+    Controlled by FILM_HWENC: auto (default) tries nvenc, vt and qsv in
+    order, a single name forces that encoder if available, none always
+    uses libx264.
+    """
+    choice = os.environ.get('FILM_HWENC', 'auto').lower()
+    if choice == 'auto':
+        candidates = list(HARDWARE_ENCODERS)
+    elif choice in HARDWARE_ENCODERS:
+        candidates = [choice]
+    else:
+        candidates = []
+
+    available = get_ffmpeg_encoders()
+    for name in candidates:
+        encoder, quality_args = HARDWARE_ENCODERS[name]
+        if encoder in available:
+            return ['-c:v', encoder, *quality_args]
+
+    return SOFTWARE_ENCODER_ARGS
+
+def get_video_codec_args(video_paths: list) -> list:
+    """Choose ffmpeg video codec arguments for joining the clips"""
+    # Clips from the same model normally match, so the concat demuxer can
+    # copy the H.264 stream as-is instead of re-encoding every frame
+    if can_stream_copy(video_paths):
+        print("  Clips share codec parameters, using stream copy")
+        return ['-c:v', 'copy']
+
+    encoder_args = select_encoder_args()
+    print(f"  Clips differ in codec parameters, re-encoding with {encoder_args[1]}")
+    return encoder_args
+
+def compose_film(
+    video_paths: list,
     output_path: str,
+    narration_path: Optional[str] = None,
+    music_path: Optional[str] = None,
     narration_volume: float = 1.0,
-    music_volume: float = 0.2
+    music_volume: float = 0.2,
+    log_path: Optional[str] = None
 ) -> None:
-    """Compose final video with audio tracks"""
-    print(f"Composing final video...")
-    print(f"  Narration volume: {narration_volume}")
-    print(f"  Music volume: {music_volume}")
-
-    filter_complex = (
-        f"[1:a]volume={narration_volume}[narr];"
-        f"[2:a]volume={music_volume}[music];"
-        f"[narr][music]amix=inputs=2:duration=longest[audio]"
-    )
+    """
+    Concatenate clips and mix in audio tracks with a single ffmpeg run.
 
-    cmd = [
-        'ffmpeg', '-y',
-        '-i', video_path,
-        '-i', narration_path,
-        '-i', music_path,
-        '-filter_complex', filter_complex,
-        '-map', '0:v',
-        '-map', '[audio]',
-        '-c:v', 'copy',
-        '-c:a', 'aac',
-        '-b:a', '192k',
-        '-shortest',
-        output_path
+    The clips are read through the concat demuxer and muxed directly with
+    the narration/music mix, so no intermediate combined video is written.
+    ffmpeg's warnings and errors are appended to log_path.
+    """
+    print(f"Composing {len(video_paths)} video clips...")
+
+    video_codec_args = get_video_codec_args(video_paths)
+
+    # Create concat file
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
+        for path in video_paths:
+            f.write(f"file '{os.path.abspath(path)}'\n")
+        concat_file = f.name
+
+    input_args = [
+        '-f', 'concat',
+        '-safe', '0',
+        '-i', concat_file,
     ]
 
-    subprocess.run(cmd, check=True, capture_output=True)
+    if narration_path and music_path:
+        print(f"  Narration volume: {narration_volume}")
+        print(f"  Music volume: {music_volume}")
+
+        filter_complex = (
+            f"[1:a]volume={narration_volume}[narr];"
+            f"[2:a]volume={music_volume}[music];"
+            f"[narr][music]amix=inputs=2:duration=longest[audio]"
+        )
+        input_args += ['-i', narration_path, '-i', music_path]
+        map_args = ['-filter_complex', filter_complex, '-map', '0:v', '-map', '[audio]']
+        audio_args = ['-c:a', 'aac', '-b:a', '192k', '-shortest']
+    elif narration_path:
+        # Just add narration
+        input_args += ['-i', narration_path]
+        map_args = ['-map', '0:v', '-map', '1:a']
+        audio_args = ['-c:a', 'aac', '-shortest']
+    else:
+        # Just join the clips
+        map_args = []
+        audio_args = []
+
+    def run_compose(codec_args: list) -> None:
+        run_ffmpeg([*input_args, *map_args, *codec_args, *audio_args, output_path], log_path)
+
+    try:
+        try:
+            run_compose(video_codec_args)
+        except subprocess.CalledProcessError:
+            # ffmpeg may list a hardware encoder the machine cannot actually use
+            if video_codec_args in (['-c:v', 'copy'], SOFTWARE_ENCODER_ARGS):
+                raise
+            print(f"  {video_codec_args[1]} failed, falling back to libx264")
+            run_compose(SOFTWARE_ENCODER_ARGS)
+    finally:
+        os.unlink(concat_file)
 
 def process_scene_json(json_path: str) -> None:
     """Compose final video from scene JSON"""
@@ -101,11 +202,6 @@ def process_scene_json(json_path: str) -> None:
 
     print(f"Found {len(clips)} video clips")
 
-    # Concatenate videos
-    combined_path = os.path.join(dirs['videos'], 'combined.mp4')
-    concatenate_videos(clips, combined_path)
-    print(f"Combined video: {combined_path}")
-
     # Get audio paths
     narration_path = data['narration'].get('audioPath')
     music_path = data['output'].get('musicPath') or os.path.join(dirs['audio'], 'music.mp3')
@@ -121,36 +217,20 @@ def process_scene_json(json_path: str) -> None:
     # Compose final video
     final_path = get_final_video_path(dirs, film_slug)
 
-    if narration_path and music_path:
-        compose_final_video(
-            combined_path,
-            narration_path,
-            music_path,
-            final_path,
-            narration_volume=data['config'].get('narrationVolume', 1.0),
-            music_volume=data['config'].get('musicVolume', 0.2)
-        )
-    elif narration_path:
-        # Just add narration
-        cmd = [
-            'ffmpeg', '-y',
-            '-i', combined_path,
-            '-i', narration_path,
-            '-c:v', 'copy',
-            '-c:a', 'aac',
-            '-shortest',
-            final_path
-        ]
-        subprocess.run(cmd, check=True, capture_output=True)
-    else:
-        # Just copy video
-        import shutil
-        shutil.copy(combined_path, final_path)
+    compose_film(
+        clips,
+        final_path,
+        narration_path=narration_path,
+        music_path=music_path,
+        narration_volume=data['config'].get('narrationVolume', 1.0),
+        music_volume=data['config'].get('musicVolume', 0.2),
+        log_path=get_ffmpeg_log_path(dirs)
+    )
 
     # Update JSON
     data['output']['finalVideo'] = final_path
-    data['output']['combinedVideo'] = combined_path
-    save_scene_json(json_path, data)
+    data['output'].pop('combinedVideo', None)
+    save_scene_json(json_path, data, pretty=True)
 
     # Get file size
     size_mb = os.path.getsize(final_path) / (1024 * 1024)
@@ -160,11 +240,6 @@ def process_scene_json(json_path: str) -> None:
     print(f"Output: {final_path}")
     print(f"Size: {size_mb:.1f} MB")
 
-    # Clean up combined video
-    if os.path.exists(combined_path):
-        os.remove(combined_path)
-        print("Cleaned up temporary files")
-
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: python compose_video.py <scene.json>")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Run any stage of the film pipeline from one long-lived process"""
+
+import sys
+
+
+def run_analyze(args: list) -> None:
+    """Analyze a seed image and create scene.json"""
+    import analyze_seed_image
+    json_path = analyze_seed_image.main(args)
+    print(f"\nNext: python film.py pipeline {json_path}")
+
+
+def run_images(args: list) -> None:
+    """Generate images and face swaps"""
+    import generate_images
+    generate_images.process_scene_json(args[0], force="--force" in args[1:])
+
+
+def run_videos(args: list) -> None:
+    """Generate video clips"""
+    import generate_videos
+    generate_videos.process_scene_json(args[0], force="--force" in args[1:])
+
+
+def run_narration(args: list) -> None:
+    """Generate narration audio"""
+    import generate_narration
+    generate_narration.process_scene_json(args[0])
+
+
+def run_music(args: list) -> None:
+    """Generate background music"""
+    import generate_music
+    generate_music.process_scene_json(args[0])
+
+
+def run_compose(args: list) -> None:
+    """Compose the final video"""
+    import compose_video
+    compose_video.process_scene_json(args[0])
+
+
+def run_all(args: list) -> None:
+    """Run every stage after analysis"""
+    import run_pipeline
+    run_pipeline.run_pipeline(args[0])
+
+
+# Subcommand -> (handler, arguments). Stage modules are imported on first use,
+# so e.g. compose never loads the fal/replicate/Gemini clients.
+COMMANDS = {
+    'analyze': (run_analyze, '<seed_image> <prompt> [options]'),
+    'images': (run_images, '<scene.json> [--force]'),
+    'videos': (run_videos, '<scene.json> [--force]'),
+    'narration': (run_narration, '<scene.json>'),
+    'music': (run_music, '<scene.json>'),
+    'compose': (run_compose, '<scene.json>'),
+    'pipeline': (run_all, '<scene.json>'),
+}
+
+
+def print_usage():
+    """Print usage information"""
+    print("Usage: python film.py <command> [arguments]")
+    print("\nCommands:")
+    for name, (handler, usage) in COMMANDS.items():
+        print(f"  {name:<10} {usage}")
+        print(f"  {'':<10} {handler.__doc__}")
+    print("\nExample:")
+    print('  python film.py analyze photo.jpg "An epic adventure in nature"')
+    print("  python film.py pipeline OUTPUT/<film-slug>/scene.json")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in COMMANDS:
+        print_usage()
+        sys.exit(1)
+
+    handler, _ = COMMANDS[sys.argv[1]]
+    handler(sys.argv[2:])
@@ -3,8 +3,8 @@
 
 import os
 import sys
-import fal_client
-from typing import Optional, Tuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Optional, Tuple
 
 # Try to import replicate, but handle Python 3.14 compatibility issues
 try:
@@ -18,9 +18,15 @@ from providers import get_image_provider
 from model_config import get_provider_and_model, get_tier_config, DEFAULT_TIER
 from utils import (
     load_scene_json, save_scene_json, download_file,
-    get_output_dirs, ensure_output_dirs, get_image_path
+    get_output_dirs, ensure_output_dirs, get_image_path, retry,
+    append_ndjson, write_ndjson, hash_file, hash_text,
+    get_cache_dir, link_or_copy, parse_json
 )
 
+# Maximum number of base images / face swaps running at the same time
+MAX_CONCURRENT_IMAGES = 4
+MAX_CONCURRENT_FACE_SWAPS = 4
+
 
 def get_configured_provider(data: dict) -> Tuple[any, str]:
     """
@@ -47,6 +53,7 @@ def get_configured_provider(data: dict) -> Tuple[any, str]:
     return provider, model
 
 
+@retry()
 def apply_face_swap(base_image_url: str, avatar_path: str) -> Optional[str]:
     """Apply face swap using Replicate"""
     if not REPLICATE_AVAILABLE:
@@ -55,7 +62,9 @@ def apply_face_swap(base_image_url: str, avatar_path: str) -> Optional[str]:
 
     print(f"  Applying face swap...")
 
-    # Upload avatar to fal storage for use with replicate
+    # Upload avatar to fal storage for use with replicate (imported here so
+    # runs without face swaps don't need fal-client loaded)
+    import fal_client
     avatar_url = fal_client.upload_file(avatar_path)
 
     output = replicate.run(
@@ -69,10 +78,150 @@ def apply_face_swap(base_image_url: str, avatar_path: str) -> Optional[str]:
     return output
 
 
-def process_scene_json(json_path: str) -> None:
-    """Process all sub-scenes in the JSON file"""
-    data = load_scene_json(json_path)
+def load_image_manifest(progress_path: str) -> dict:
+    """
+    Load the latest progress record for each sub-scene.
+
+    Records carry the hash of the model + prompt that produced the image and
+    the hash of the image file, so edits to either invalidate the entry.
+
+    Returns:
+        Dictionary of sub-scene ID -> progress record
+    """
+    manifest = {}
+    if not os.path.exists(progress_path):
+        return manifest
+
+    with open(progress_path, 'rb') as f:
+        for line in f:
+            try:
+                record = parse_json(line)
+            except ValueError:
+                # Line cut short by an interrupted run
+                continue
+            manifest[record['subSceneId']] = record
+
+    return manifest
+
+
+def get_prompt_hash(model: str, prompt: str) -> str:
+    """Hash the inputs that determine a generated image"""
+    return hash_text(f"{model}\n{prompt}")
+
+
+def is_already_generated(sub_scene: dict, record: Optional[dict], prompt_hash: str) -> bool:
+    """Check whether a previous run already produced this sub-scene's images"""
+    if not record or record.get('promptHash') != prompt_hash:
+        return False
+
+    base_path = record.get('outputImagePath')
+    if not base_path or not os.path.exists(base_path):
+        return False
+    if record.get('fileHash') != hash_file(base_path):
+        return False
+
+    if sub_scene.get('hasMainCharacter', False) and REPLICATE_AVAILABLE:
+        swapped_path = record.get('faceSwappedImagePath')
+        if not swapped_path or not os.path.exists(swapped_path):
+            return False
+
+    return True
+
+
+def get_image_cache_path(cache_dir: str, provider_name: str, model: str, prompt: str) -> str:
+    """
+    Get the cache file for a base image, keyed by provider, model and prompt.
+    """
+    key = hash_text(f"{provider_name}\n{get_prompt_hash(model, prompt)}")
+    return os.path.join(cache_dir, 'images', f"{key}.png")
+
+
+def generate_base_image(
+    provider,
+    model: str,
+    dirs: dict,
+    sub_scene: dict,
+    cache_path: Optional[str] = None
+) -> Tuple[Optional[str], str]:
+    """
+    Generate and download the base image for one sub-scene.
+
+    Args:
+        cache_path: Image cache file to reuse if present and fill otherwise
+
+    Returns:
+        Tuple of (image_url, base_image_path); image_url is None when the
+        image came from the cache
+    """
+    sub_id = sub_scene['subSceneId']
+    prompt = sub_scene['textToImagePrompt']
+    base_path = get_image_path(dirs, sub_id, swapped=False)
+
+    if cache_path and os.path.exists(cache_path):
+        link_or_copy(cache_path, base_path)
+        print(f"  [{sub_id}] Base image reused from cache: {base_path}")
+        return None, base_path
+
+    print(f"  [{sub_id}] Generating image: {prompt[:60]}...")
+
+    image_url = retry()(provider.generate_image)(prompt, model=model)
+    download_file(image_url, base_path)
+    if cache_path:
+        link_or_copy(base_path, cache_path)
+    print(f"  [{sub_id}] Base image saved: {base_path}")
+
+    return image_url, base_path
+
 
+def generate_face_swap(
+    image_url: Optional[str],
+    avatar_path: str,
+    dirs: dict,
+    sub_id: str
+) -> Optional[str]:
+    """
+    Face-swap the avatar onto a generated base image and download the result.
+
+    Args:
+        image_url: URL of the base image, or None to upload the local copy
+
+    Returns:
+        Path of the face-swapped image, or None if face swap is unavailable
+    """
+    if image_url is None and REPLICATE_AVAILABLE:
+        # Cached base images have no hosted URL for Replicate to fetch
+        import fal_client
+        image_url = retry()(fal_client.upload_file)(get_image_path(dirs, sub_id, swapped=False))
+
+    swapped_url = apply_face_swap(image_url, avatar_path)
+    if not swapped_url:
+        return None
+
+    swapped_path = get_image_path(dirs, sub_id, swapped=True)
+    download_file(swapped_url, swapped_path)
+    print(f"  [{sub_id}] Face-swapped image saved: {swapped_path}")
+    return swapped_path
+
+
+def generate_scene_images(
+    data: dict,
+    checkpoint: Optional[Callable[[], None]] = None,
+    force: bool = False
+) -> None:
+    """
+    Generate images for all sub-scenes, updating the scene data in place.
+
+    Every finished sub-scene is appended to images/.progress.ndjson, and
+    checkpoint (if given) is called each time all sub-scenes of a scene
+    are done. Sub-scenes whose images were already generated from the same
+    model and prompt are skipped, and base images are cached under
+    <OUTPUT>/.cache/images so the same prompt is never generated twice.
+
+    Args:
+        data: Scene JSON data
+        checkpoint: Callback that persists the scene data
+        force: Regenerate images even if they already exist or are cached
+    """
     film_slug = data['output']['filmSlug']
     base_dir = data['output']['baseDir']
     avatar_path = data['avatarPath']
@@ -99,69 +248,142 @@ def process_scene_json(json_path: str) -> None:
 
     images_generated = 0
     images_skipped = 0
+    pending = []
+    remaining_per_scene = {}
+    progress_path = os.path.join(dirs['images'], '.progress.ndjson')
+    manifest = {} if force else load_image_manifest(progress_path)
+    cache_dir = get_cache_dir(base_dir)
+
+    # Compact the log to one record per sub-scene before appending to it
+    write_ndjson(progress_path, manifest.values())
 
     for scene in data['scenes']:
-        print(f"\nScene {scene['sceneNumber']}:")
+        scene_number = scene['sceneNumber']
 
         for sub_scene in scene['subScenes']:
             sub_id = sub_scene['subSceneId']
-            print(f"\n  Sub-scene {sub_id}:")
 
             # Check if this sub-scene uses the seed image (seed mode)
             if sub_scene.get('useSeedImage', False):
-                print(f"    SKIPPED: Using seed image")
+                print(f"\n  Sub-scene {sub_id}: SKIPPED (using seed image)")
                 print(f"    Seed image: {sub_scene.get('outputImagePath', 'N/A')}")
                 images_skipped += 1
                 continue
 
             # Check if textToImagePrompt exists (required for generation)
-            prompt = sub_scene.get('textToImagePrompt')
-            if not prompt:
-                print(f"    SKIPPED: No textToImagePrompt defined")
+            if not sub_scene.get('textToImagePrompt'):
+                print(f"\n  Sub-scene {sub_id}: SKIPPED (no textToImagePrompt defined)")
                 images_skipped += 1
                 continue
 
-            # Generate base image
-            try:
-                print(f"  Generating image: {prompt[:60]}...")
-
-                image_url = provider.generate_image(prompt, model=model)
-                base_path = get_image_path(dirs, sub_id, swapped=False)
-                download_file(image_url, base_path)
-                sub_scene['outputImagePath'] = base_path
-                print(f"    Base image saved: {base_path}")
-                images_generated += 1
-
-                # Apply face swap if needed
-                if sub_scene.get('hasMainCharacter', False):
-                    swapped_url = apply_face_swap(image_url, avatar_path)
-                    if swapped_url:
-                        swapped_path = get_image_path(dirs, sub_id, swapped=True)
-                        download_file(swapped_url, swapped_path)
-                        sub_scene['faceSwappedImagePath'] = swapped_path
-                        print(f"    Face-swapped image saved: {swapped_path}")
-                    else:
-                        sub_scene['faceSwappedImagePath'] = None
-                else:
-                    sub_scene['faceSwappedImagePath'] = None
+            # Skip images already generated for the same model + prompt
+            record = manifest.get(sub_id)
+            prompt_hash = get_prompt_hash(model, sub_scene['textToImagePrompt'])
+            if is_already_generated(sub_scene, record, prompt_hash):
+                print(f"\n  Sub-scene {sub_id}: SKIPPED (already generated)")
+                sub_scene['outputImagePath'] = record['outputImagePath']
+                sub_scene['faceSwappedImagePath'] = record.get('faceSwappedImagePath')
+                sub_scene.pop('imageError', None)
+                images_skipped += 1
+                continue
 
-            except Exception as e:
-                print(f"    ERROR: {e}")
-                sub_scene['imageError'] = str(e)
+            cache_path = get_image_cache_path(
+                cache_dir, provider.provider_name, model, sub_scene['textToImagePrompt']
+            )
+            if force and os.path.exists(cache_path):
+                os.remove(cache_path)
+
+            pending.append((scene_number, sub_scene, cache_path))
+            remaining_per_scene[scene_number] = remaining_per_scene.get(scene_number, 0) + 1
+
+    print(f"\nGenerating {len(pending)} images ({MAX_CONCURRENT_IMAGES} at a time)...")
+
+    def finish_sub_scene(scene_number: int) -> None:
+        # Save once per scene rather than after every sub-scene
+        remaining_per_scene[scene_number] -= 1
+        if remaining_per_scene[scene_number] == 0 and checkpoint:
+            checkpoint()
+
+    # Base images (fal/Together) and face swaps (Replicate) run on separate
+    # pools: as soon as a base image is ready its face swap is handed off and
+    # the next base image starts, so the two services work in parallel.
+    # Results are applied to the scene data on this thread only.
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_IMAGES) as image_pool, \
+            ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FACE_SWAPS) as swap_pool:
+        in_flight = {
+            image_pool.submit(generate_base_image, provider, model, dirs, sub_scene, cache_path):
+                ('base', scene_number, sub_scene)
+            for scene_number, sub_scene, cache_path in pending
+        }
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
 
-            # Save progress after each sub-scene
-            save_scene_json(json_path, data)
+            for future in done:
+                stage, scene_number, sub_scene = in_flight.pop(future)
+                sub_id = sub_scene['subSceneId']
+
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"  [{sub_id}] ERROR: {e}")
+                    sub_scene['imageError'] = str(e)
+                    finish_sub_scene(scene_number)
+                    continue
+
+                if stage == 'base':
+                    image_url, base_path = result
+                    sub_scene['outputImagePath'] = base_path
+                    sub_scene['faceSwappedImagePath'] = None
+                    sub_scene.pop('imageError', None)
+                    images_generated += 1
+
+                    if sub_scene.get('hasMainCharacter', False):
+                        swap = swap_pool.submit(
+                            generate_face_swap, image_url, avatar_path, dirs, sub_id
+                        )
+                        in_flight[swap] = ('swap', scene_number, sub_scene)
+                        continue
+                else:
+                    sub_scene['faceSwappedImagePath'] = result
+
+                append_ndjson(progress_path, {
+                    'subSceneId': sub_id,
+                    'promptHash': get_prompt_hash(model, sub_scene['textToImagePrompt']),
+                    'fileHash': hash_file(sub_scene['outputImagePath']),
+                    'outputImagePath': sub_scene['outputImagePath'],
+                    'faceSwappedImagePath': sub_scene['faceSwappedImagePath'],
+                })
+                print(f"  [{sub_id}] Done")
+                finish_sub_scene(scene_number)
 
     print("\n" + "=" * 50)
     print("Image generation complete!")
     print(f"Images generated: {images_generated}")
     print(f"Images skipped: {images_skipped}")
+
+
+def process_scene_json(json_path: str, force: bool = False) -> None:
+    """Process all sub-scenes in the JSON file"""
+    data = load_scene_json(json_path)
+
+    try:
+        generate_scene_images(
+            data,
+            checkpoint=lambda: save_scene_json(json_path, data),
+            force=force
+        )
+    finally:
+        save_scene_json(json_path, data, pretty=True)
+
     print(f"Scene JSON updated: {json_path}")
 
 
 def print_usage():
     """Print usage information"""
-    print("Usage: python generate_images.py <scene.json>")
+    print("Usage: python generate_images.py <scene.json> [--force]")
+    print("\nImages already generated from the same model and prompt are skipped, and")
+    print("base images are reused from OUTPUT/.cache/images; pass --force to regenerate them.")
     print("\nThe scene.json can include a 'modelConfig' section:")
     print("""
 {
@@ -184,4 +406,4 @@ if __name__ == "__main__":
         sys.exit(1)
 
     json_path = sys.argv[1]
-    process_scene_json(json_path)
+    process_scene_json(json_path, force="--force" in sys.argv[2:])
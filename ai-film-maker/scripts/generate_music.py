@@ -5,11 +5,14 @@ import os
 import sys
 import subprocess
 import fal_client
+from typing import Callable, Optional
 from utils import (
     load_scene_json, save_scene_json, download_file,
-    get_output_dirs, ensure_output_dirs, get_audio_path
+    get_output_dirs, ensure_output_dirs, get_audio_path, retry,
+    run_ffmpeg, get_ffmpeg_log_path
 )
 
+@retry()
 def generate_music(prompt: str) -> str:
     """Generate music from prompt using ACE-Step"""
     print(f"Generating music: {prompt[:80]}...")
@@ -25,25 +28,47 @@ def generate_music(prompt: str) -> str:
 
     return result['audio']['url']
 
-def trim_audio(input_path: str, output_path: str, duration: int) -> None:
-    """Trim audio to specified duration using ffmpeg"""
+def is_mp3(path: str) -> bool:
+    """Check for an ID3 tag or an MPEG Layer III frame header"""
+    with open(path, 'rb') as f:
+        header = f.read(3)
+    if header[:3] == b'ID3':
+        return True
+    # 11-bit frame sync followed by layer bits 01 (Layer III)
+    return len(header) >= 2 and header[0] == 0xFF and header[1] & 0xE6 == 0xE2
+
+def trim_audio(
+    input_path: str,
+    output_path: str,
+    duration: int,
+    log_path: Optional[str] = None
+) -> None:
+    """
+    Trim audio to specified duration using ffmpeg.
+
+    MP3 input is cut with stream copy (no decode/re-encode); anything else,
+    or MP3 that can't be stream copied, is encoded with libmp3lame.
+    """
     print(f"Trimming audio to {duration} seconds...")
 
-    cmd = [
-        'ffmpeg', '-y',
-        '-i', input_path,
-        '-t', str(duration),
-        '-acodec', 'libmp3lame',
-        '-b:a', '192k',
-        output_path
-    ]
+    input_args = ['-i', input_path, '-t', str(duration)]
 
-    subprocess.run(cmd, check=True, capture_output=True)
+    if is_mp3(input_path):
+        try:
+            # Failure here is handled by re-encoding, so don't report it
+            run_ffmpeg([*input_args, '-c:a', 'copy', output_path], log_path, quiet=True)
+            return
+        except subprocess.CalledProcessError:
+            pass
 
-def process_scene_json(json_path: str) -> None:
-    """Generate music from scene JSON"""
-    data = load_scene_json(json_path)
+    run_ffmpeg([*input_args, '-acodec', 'libmp3lame', '-b:a', '192k', output_path], log_path)
 
+def generate_scene_music(data: dict, checkpoint: Optional[Callable[[], None]] = None) -> None:
+    """
+    Generate background music, updating the scene data in place.
+
+    checkpoint (if given) is called once the trimmed music is saved.
+    """
     film_slug = data['output']['filmSlug']
     base_dir = data['output']['baseDir']
     total_duration = data.get('totalDuration', 30)
@@ -65,23 +90,32 @@ def process_scene_json(json_path: str) -> None:
 
         # Trim to video duration
         trimmed_path = get_audio_path(dirs, "music.mp3")
-        trim_audio(raw_path, trimmed_path, total_duration)
+        trim_audio(raw_path, trimmed_path, total_duration, get_ffmpeg_log_path(dirs))
         print(f"Trimmed music saved: {trimmed_path}")
 
         # Update JSON
         data['output']['musicPath'] = trimmed_path
         data['output']['musicRawPath'] = raw_path
-        save_scene_json(json_path, data)
+        if checkpoint:
+            checkpoint()
 
     except Exception as e:
         print(f"ERROR: {e}")
         data['output']['musicError'] = str(e)
-        save_scene_json(json_path, data)
         raise
 
     print("\n" + "=" * 50)
     print("Music generation complete!")
 
+def process_scene_json(json_path: str) -> None:
+    """Generate music from scene JSON"""
+    data = load_scene_json(json_path)
+
+    try:
+        generate_scene_music(data)
+    finally:
+        save_scene_json(json_path, data, pretty=True)
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: python generate_music.py <scene.json>")
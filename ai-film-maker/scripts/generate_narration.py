@@ -4,9 +4,10 @@
 import os
 import sys
 import fal_client
+from typing import Callable, Optional
 from utils import (
     load_scene_json, save_scene_json, download_file,
-    get_output_dirs, ensure_output_dirs, get_audio_path
+    get_output_dirs, ensure_output_dirs, get_audio_path, retry
 )
 
 # Available voice IDs
@@ -20,6 +21,7 @@ FEMALE_VOICES = [
     'af_kore', 'af_nicole', 'af_nova', 'af_river', 'af_sarah', 'af_sky'
 ]
 
+@retry()
 def generate_narration(text: str, voice_id: str = "am_adam", speed: float = 1.0) -> str:
     """Generate narration audio using Kokoro TTS"""
     print(f"Generating narration with voice '{voice_id}' at {speed}x speed...")
@@ -37,10 +39,12 @@ def generate_narration(text: str, voice_id: str = "am_adam", speed: float = 1.0)
 
     return result['audio']['url']
 
-def process_scene_json(json_path: str) -> None:
-    """Generate narration from scene JSON"""
-    data = load_scene_json(json_path)
+def generate_scene_narration(data: dict, checkpoint: Optional[Callable[[], None]] = None) -> None:
+    """
+    Generate narration audio, updating the scene data in place.
 
+    checkpoint (if given) is called once the narration is saved.
+    """
     film_slug = data['output']['filmSlug']
     base_dir = data['output']['baseDir']
 
@@ -63,19 +67,28 @@ def process_scene_json(json_path: str) -> None:
         narration['audioPath'] = audio_path
         narration['voice'] = voice_id
         narration['speed'] = speed
+        if checkpoint:
+            checkpoint()
 
         print(f"\nNarration saved: {audio_path}")
-        save_scene_json(json_path, data)
 
     except Exception as e:
         print(f"ERROR: {e}")
         narration['error'] = str(e)
-        save_scene_json(json_path, data)
         raise
 
     print("\n" + "=" * 50)
     print("Narration generation complete!")
 
+def process_scene_json(json_path: str) -> None:
+    """Generate narration from scene JSON"""
+    data = load_scene_json(json_path)
+
+    try:
+        generate_scene_narration(data)
+    finally:
+        save_scene_json(json_path, data, pretty=True)
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: python generate_narration.py <scene.json>")
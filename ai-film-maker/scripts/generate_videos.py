@@ -3,15 +3,35 @@
 
 import os
 import sys
-from typing import Tuple
+import time
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, List, Optional, Tuple
 
 from providers import get_video_provider
 from model_config import get_provider_and_model, get_tier_config, DEFAULT_TIER
 from utils import (
     load_scene_json, save_scene_json, download_file,
-    get_output_dirs, ensure_output_dirs, get_video_path
+    get_output_dirs, ensure_output_dirs, get_video_path, retry,
+    is_rejected_submission, get_cache_dir, hash_text, link_or_copy, read_image
 )
 
+# Maximum number of video clips generating at the same time
+MAX_CONCURRENT_VIDEOS = 5
+
+# Maximum number of source images uploading ahead of generation
+MAX_CONCURRENT_UPLOADS = 4
+
+# Maximum number of finished clips downloading at the same time
+MAX_CONCURRENT_DOWNLOADS = 8
+
+# Seconds between status checks of queued clips
+POLL_INTERVAL = 5
+
+# Finished clips between scene.json checkpoints
+CHECKPOINT_EVERY = 5
+
 
 def get_configured_provider(data: dict) -> Tuple[any, str]:
     """
@@ -38,18 +58,117 @@ def get_configured_provider(data: dict) -> Tuple[any, str]:
     return provider, model
 
 
-def process_scene_json(json_path: str) -> None:
-    """Process all sub-scenes in the JSON file"""
-    data = load_scene_json(json_path)
+def get_hedge_routes(data: dict) -> List[Tuple[any, str]]:
+    """
+    Get the extra providers each clip is also sent to, if hedging is enabled.
+
+    Configured in scene.json as a list of provider/model pairs:
+    "modelConfig": {"hedgeImageToVideo": [{"provider": "google", "model": "veo-3-fast"}]}
+
+    Returns:
+        List of (provider_instance, model_name)
+    """
+    hedges = data.get('modelConfig', {}).get('hedgeImageToVideo', [])
+    return [(get_video_provider(hedge['provider']), hedge['model']) for hedge in hedges]
+
+
+def submit_clip(
+    provider,
+    model: str,
+    sub_scene: dict,
+    image_path: str,
+    upload: Optional[Future] = None
+):
+    """
+    Start generating one sub-scene's video clip.
+
+    Args:
+        upload: Pending provider.upload_image() of image_path, if started early
+
+    Returns:
+        Handle for provider.poll_video()
+    """
+    sub_id = sub_scene['subSceneId']
+    print(f"  [{sub_id}] Generating {sub_scene['duration']}s video from {image_path}")
 
+    extra_args = {'image_url': upload.result()} if upload else {}
+    return retry(should_retry=is_rejected_submission)(provider.submit_video)(
+        image_path,
+        sub_scene['imageToVideoPrompt'],
+        sub_scene['duration'],
+        model=model,
+        **extra_args
+    )
+
+
+@contextmanager
+def upload_session(routes: List[Tuple[any, str]]):
+    """Clear the routes' cached image uploads when the run ends"""
+    try:
+        yield
+    finally:
+        for route_provider, _ in routes:
+            route_provider.clear_uploads()
+
+
+def get_clip_cache_path(cache_dir: str, route_key: str, sub_scene: dict, image_path: str) -> str:
+    """
+    Get the cache file for a clip, keyed by everything that determines it:
+    provider and model (route_key), source image contents, motion prompt
+    and duration.
+    """
+    key = hash_text("\n".join([
+        route_key,
+        read_image(image_path)[2],
+        sub_scene['imageToVideoPrompt'],
+        str(sub_scene['duration']),
+    ]))
+    return os.path.join(cache_dir, 'videos', f"{key}.mp4")
+
+
+def download_clip(video_url: str, dirs: dict, sub_id: str, cache_path: str) -> str:
+    """
+    Download a generated clip into the videos directory and the clip cache.
+
+    Returns:
+        Path of the downloaded video
+    """
+    video_path = get_video_path(dirs, sub_id)
+    download_file(video_url, video_path)
+    link_or_copy(video_path, cache_path)
+    print(f"  [{sub_id}] Video saved: {video_path}")
+    return video_path
+
+
+def generate_scene_videos(
+    data: dict,
+    checkpoint: Optional[Callable[[], None]] = None,
+    force: bool = False
+) -> None:
+    """
+    Generate video clips for all sub-scenes, updating the scene data in place.
+
+    Clips are cached under <OUTPUT>/.cache/videos, so a sub-scene whose
+    image, prompt, duration and model match an earlier run (of any film)
+    reuses that clip instead of calling the provider again. With hedging,
+    a clip is cached under the route that actually generated it, and a
+    cached clip from any configured route is reused.
+
+    Args:
+        data: Scene JSON data
+        checkpoint: Callback that persists the scene data, called every
+            CHECKPOINT_EVERY finished sub-scenes and after any failure
+        force: Regenerate clips even if they are cached
+    """
     film_slug = data['output']['filmSlug']
     base_dir = data['output']['baseDir']
     mode = data.get('mode', 'default')
 
     dirs = ensure_output_dirs(base_dir, film_slug)
 
-    # Get configured provider
+    # Get configured provider (first route) and any hedge providers
     provider, model = get_configured_provider(data)
+    routes = [(provider, model)] + get_hedge_routes(data)
 
     # Get tier info for display
     model_config = data.get('modelConfig', {})
@@ -61,55 +180,255 @@ def process_scene_json(json_path: str) -> None:
     print(f"Quality tier: {tier_info['name']} ({tier})")
     print(f"Provider: {provider.provider_name}")
     print(f"Model: {model}")
+    for hedge_provider, hedge_model in routes[1:]:
+        print(f"Hedge: {hedge_provider.provider_name} {hedge_model}")
     print(f"Output directory: {dirs['videos']}")
     print("-" * 50)
 
-    for scene in data['scenes']:
-        print(f"\nScene {scene['sceneNumber']}:")
+    # Invariant parts of every clip's cache key, one per route
+    cache_dir = get_cache_dir(base_dir)
+    route_keys = [
+        f"{route_provider.provider_name}\n{route_model}"
+        for route_provider, route_model in routes
+    ]
+
+    pending = []
 
+    # Primary route's cache path -> later sub-scenes asking for the same clip
+    # (same image, prompt, duration and models); only the first one is generated
+    duplicates = {}
+    first_sub_id = {}
+    for scene in data['scenes']:
         for sub_scene in scene['subScenes']:
             sub_id = sub_scene['subSceneId']
-            duration = sub_scene['duration']
-            print(f"\n  Sub-scene {sub_id} ({duration}s):")
 
             # Use face-swapped image if available, otherwise base image
             image_path = sub_scene.get('faceSwappedImagePath') or sub_scene.get('outputImagePath')
 
             if not image_path or not os.path.exists(image_path):
-                print(f"    SKIPPED: No image found")
+                print(f"\n  Sub-scene {sub_id}: SKIPPED (no image found)")
                 continue
 
-            try:
-                video_url = provider.generate_video(
-                    image_path,
-                    sub_scene['imageToVideoPrompt'],
-                    duration,
-                    model=model
-                )
+            # Cache paths by route, so a clip is stored under the route that
+            # generated it; a clip cached by any route is reused
+            cache_paths = [
+                get_clip_cache_path(cache_dir, route_key, sub_scene, image_path)
+                for route_key in route_keys
+            ]
+            cached = None if force else next(
+                (path for path in cache_paths if os.path.exists(path)), None
+            )
+            if cached:
                 video_path = get_video_path(dirs, sub_id)
-                download_file(video_url, video_path)
+                link_or_copy(cached, video_path)
+                sub_scene['outputVideoPath'] = video_path
+                sub_scene.pop('videoError', None)
+                print(f"\n  Sub-scene {sub_id}: SKIPPED (cached clip)")
+                continue
+
+            cache_path = cache_paths[0]
+            if cache_path in first_sub_id:
+                print(f"\n  Sub-scene {sub_id}: same clip as {first_sub_id[cache_path]}, reusing it")
+                duplicates[cache_path].append(sub_scene)
+                continue
+
+            first_sub_id[cache_path] = sub_id
+            duplicates[cache_path] = []
+            pending.append((sub_scene, image_path, cache_paths))
+
+    print(f"\nGenerating {len(pending)} videos ({MAX_CONCURRENT_VIDEOS} at a time)...")
+
+    unsaved = 0
+
+    # Clips are independent, so they are generated concurrently; results are
+    # applied to the scene data on this thread only. Source images upload on
+    # their own pool ahead of time where the provider takes pre-uploaded
+    # images. Queued clips are all checked every POLL_INTERVAL, in parallel
+    # (providers without a queue just generate inside submit_video), and
+    # finished clips download on a third pool so a download never holds up
+    # the next generation. Providers' cached uploads are dropped at the end.
+    #
+    # With hedging, every clip is requested from each route and the first
+    # video back wins. The slower requests are abandoned, not cancelled, so
+    # providers still bill for them.
+    with upload_session(routes), \
+            ThreadPoolExecutor(max_workers=MAX_CONCURRENT_VIDEOS * len(routes)) as executor, \
+            ThreadPoolExecutor(max_workers=MAX_CONCURRENT_UPLOADS) as upload_pool, \
+            ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DOWNLOADS) as download_pool:
+        uploads = {}
+        for sub_scene, image_path, _ in pending:
+            for route, (route_provider, _) in enumerate(routes):
+                if route_provider.accepts_image_url:
+                    uploads[(sub_scene['subSceneId'], route)] = upload_pool.submit(
+                        route_provider.upload_image, image_path
+                    )
+
+        waiting = deque(pending)
+        clips = {}
+        in_flight = {}
+        generating = {}
+
+        # Sub-scene ID -> number of its requests not yet failed, for clips
+        # still waiting on a video
+        active = {}
+
+        def start_clips() -> None:
+            # Keep at most MAX_CONCURRENT_VIDEOS clips submitting or generating
+            while waiting and len(active) < MAX_CONCURRENT_VIDEOS:
+                sub_scene, image_path, cache_paths = waiting.popleft()
+                sub_id = sub_scene['subSceneId']
+                clips[sub_id] = (sub_scene, cache_paths)
+                active[sub_id] = len(routes)
+
+                for route, (route_provider, route_model) in enumerate(routes):
+                    future = executor.submit(
+                        submit_clip, route_provider, route_model, sub_scene, image_path,
+                        uploads.get((sub_id, route))
+                    )
+                    in_flight[future] = ('submit', sub_id, route)
+
+        def finish_clip(sub_id: str, video_path: Optional[str], error=None) -> None:
+            nonlocal unsaved
+            sub_scene, cache_paths = clips[sub_id]
+            same_clip = duplicates[cache_paths[0]]
+
+            if error is None:
                 sub_scene['outputVideoPath'] = video_path
-                print(f"    Video saved: {video_path}")
 
                 # Remove any previous error
-                if 'videoError' in sub_scene:
-                    del sub_scene['videoError']
+                sub_scene.pop('videoError', None)
+
+                for duplicate in same_clip:
+                    duplicate_path = get_video_path(dirs, duplicate['subSceneId'])
+                    link_or_copy(video_path, duplicate_path)
+                    duplicate['outputVideoPath'] = duplicate_path
+                    duplicate.pop('videoError', None)
+            else:
+                print(f"  [{sub_id}] ERROR: {error}")
+                for failed in [sub_scene, *same_clip]:
+                    failed['videoError'] = str(error)
+                unsaved = CHECKPOINT_EVERY
 
-            except Exception as e:
-                print(f"    ERROR: {e}")
-                sub_scene['videoError'] = str(e)
+            # Save progress every few clips (the caller saves at the end)
+            unsaved += 1
+            if checkpoint and unsaved >= CHECKPOINT_EVERY:
+                checkpoint()
+                unsaved = 0
 
-            # Save progress after each sub-scene
-            save_scene_json(json_path, data)
+        def request_failed(sub_id: str, error: Exception) -> None:
+            # A clip fails once every route has failed
+            if sub_id not in active:
+                return
+            active[sub_id] -= 1
+            if active[sub_id] == 0:
+                del active[sub_id]
+                finish_clip(sub_id, None, error)
+
+        def video_ready(sub_id: str, route: int, video_url: str) -> None:
+            # First video back wins; other routes' requests are dropped
+            del active[sub_id]
+            for key in [key for key in generating if key[0] == sub_id]:
+                del generating[key]
+
+            if len(routes) > 1:
+                print(f"  [{sub_id}] Video generated by {routes[route][0].provider_name}")
+            else:
+                print(f"  [{sub_id}] Video generated")
+
+            # Cached under the winning route, never as another model's output
+            download = download_pool.submit(
+                download_clip, video_url, dirs, sub_id, clips[sub_id][1][route]
+            )
+            in_flight[download] = ('download', sub_id, route)
+
+        # Status checks are quick, so they get a shorter retry budget
+        poll_video = [
+            retry(max_attempts=3, initial_wait=1.0)(route_provider.poll_video)
+            for route_provider, _ in routes
+        ]
+        polling = set()
+
+        def poll_clips() -> None:
+            # One status check per queued request, all sent at once over the
+            # pooled keep-alive connections rather than one after another
+            for (sub_id, route), handle in generating.items():
+                if (sub_id, route) in polling:
+                    continue
+                polling.add((sub_id, route))
+                future = executor.submit(poll_video[route], handle)
+                in_flight[future] = ('poll', sub_id, route)
+
+        next_poll = time.monotonic()
+
+        start_clips()
+        while in_flight or generating:
+            poll_wait = max(0, next_poll - time.monotonic()) if generating else None
+            if in_flight:
+                done, _ = wait(in_flight, timeout=poll_wait, return_when=FIRST_COMPLETED)
+            else:
+                time.sleep(poll_wait)
+                done = set()
+
+            for future in done:
+                stage, sub_id, route = in_flight.pop(future)
+
+                if stage == 'poll':
+                    polling.discard((sub_id, route))
+                    # Skip checks on requests another route has since beaten
+                    if (sub_id, route) not in generating:
+                        continue
+
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if stage == 'poll':
+                        del generating[(sub_id, route)]
+                    if stage == 'download':
+                        finish_clip(sub_id, None, e)
+                    else:
+                        request_failed(sub_id, e)
+                    continue
+
+                if stage == 'poll':
+                    # Finished videos go to download
+                    if result:
+                        video_ready(sub_id, route, result)
+                elif stage == 'download':
+                    finish_clip(sub_id, result)
+                elif sub_id in active:
+                    generating[(sub_id, route)] = result
+
+            if generating and time.monotonic() >= next_poll:
+                poll_clips()
+                next_poll = time.monotonic() + POLL_INTERVAL
+
+            start_clips()
 
     print("\n" + "=" * 50)
     print("Video generation complete!")
+
+
+def process_scene_json(json_path: str, force: bool = False) -> None:
+    """Process all sub-scenes in the JSON file"""
+    data = load_scene_json(json_path)
+
+    try:
+        generate_scene_videos(
+            data,
+            checkpoint=lambda: save_scene_json(json_path, data),
+            force=force
+        )
+    finally:
+        save_scene_json(json_path, data, pretty=True)
+
     print(f"Scene JSON updated: {json_path}")
 
 
 def print_usage():
     """Print usage information"""
-    print("Usage: python generate_videos.py <scene.json>")
+    print("Usage: python generate_videos.py <scene.json> [--force]")
+    print("\nClips already generated from the same image, prompt, duration and model")
+    print("are reused from OUTPUT/.cache/videos; pass --force to regenerate them.")
     print("\nThe scene.json can include a 'modelConfig' section:")
     print("""
 {
@@ -118,7 +437,10 @@ def print_usage():
     "imageToVideo": {
       "provider": "fal",        // or "together", "google"
       "model": "kling-2.5-turbo"  // model shorthand or full ID
-    }
+    },
+    "hedgeImageToVideo": [      // optional: also request each clip here,
+      {"provider": "google", "model": "veo-3-fast"}  // first video back wins
+    ]
   }
 }
 """)
@@ -135,4 +457,4 @@ if __name__ == "__main__":
         sys.exit(1)
 
     json_path = sys.argv[1]
-    process_scene_json(json_path)
+    process_scene_json(json_path, force="--force" in sys.argv[2:])
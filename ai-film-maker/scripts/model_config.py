@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Model configuration and quality tiers for AI Film Maker"""
 
+import functools
 from typing import Dict, Tuple, Optional, Any
 
 # Quality tier definitions
@@ -198,7 +199,16 @@ AVAILABLE_MODELS = {
     }
 }
 
+# (operation, provider, model) -> info, for single-lookup access
+_FLAT_MODELS = {
+    (operation, provider, model): info
+    for operation, providers in AVAILABLE_MODELS.items()
+    for provider, models in providers.items()
+    for model, info in models.items()
+}
+
 
+@functools.lru_cache(maxsize=None)
 def get_tier_config(tier: str) -> Dict[str, Any]:
     """
     Get the configuration for a quality tier.
@@ -212,6 +222,7 @@ def get_tier_config(tier: str) -> Dict[str, Any]:
     return QUALITY_TIERS.get(tier, QUALITY_TIERS[DEFAULT_TIER])
 
 
+@functools.lru_cache(maxsize=None)
 def get_provider_and_model(tier: str, operation: str) -> Tuple[str, str]:
     """
     Get provider and model for a tier and operation.
@@ -228,6 +239,23 @@ def get_provider_and_model(tier: str, operation: str) -> Tuple[str, str]:
     return op_config["provider"], op_config["model"]
 
 
+def _get_tier_rates(tier_config: Dict[str, Any]) -> Tuple[float, float]:
+    """Reduce a tier's pricing to (price per image, price per video second)"""
+    video_config = tier_config["image_to_video"]
+    if "price_per_second" in video_config:
+        price_per_second = video_config["price_per_second"]
+    else:
+        # Estimate based on per-video pricing (5-second clips)
+        price_per_second = video_config.get("price_per_video", 0.30) / 5
+
+    return tier_config["text_to_image"]["price_per_image"], price_per_second
+
+
+# Tier name -> (price per image, price per video second), precomputed so cost
+# estimates are two multiplications
+TIER_RATES = {name: _get_tier_rates(config) for name, config in QUALITY_TIERS.items()}
+
+
 def estimate_cost(tier: str, num_images: int, video_seconds: int) -> float:
     """
     Estimate total cost for a video.
@@ -240,18 +268,8 @@ def estimate_cost(tier: str, num_images: int, video_seconds: int) -> float:
     Returns:
         Estimated cost in USD
     """
-    tier_config = get_tier_config(tier)
-
-    image_cost = num_images * tier_config["text_to_image"]["price_per_image"]
-
-    video_config = tier_config["image_to_video"]
-    if "price_per_second" in video_config:
-        video_cost = video_seconds * video_config["price_per_second"]
-    else:
-        # Estimate based on per-video pricing
-        video_cost = (video_seconds / 5) * video_config.get("price_per_video", 0.30)
-
-    return image_cost + video_cost
+    image_price, video_price = TIER_RATES.get(tier, TIER_RATES[DEFAULT_TIER])
+    return num_images * image_price + video_seconds * video_price
 
 
 def list_available_tiers() -> Dict[str, Dict[str, Any]]:
@@ -291,8 +309,7 @@ def get_model_info(provider: str, model: str, operation: str) -> Optional[Dict[s
     Returns:
         Model information dictionary or None
     """
-    provider_models = AVAILABLE_MODELS.get(operation, {}).get(provider, {})
-    return provider_models.get(model)
+    return _FLAT_MODELS.get((operation, provider, model))
 
 
 if __name__ == "__main__":
@@ -1,14 +1,19 @@
 #!/usr/bin/env python3
 """Provider factory and exports for AI Film Maker"""
 
+import functools
 from typing import Union
 from .base import BaseImageProvider, BaseVideoProvider
 
 
+@functools.lru_cache(maxsize=None)
 def get_image_provider(provider_name: str) -> BaseImageProvider:
     """
     Factory function to get an image generation provider.
 
+    Providers hold no per-request state, so one instance per name is
+    shared across calls (and threads).
+
     Args:
         provider_name: Provider name (fal, together)
 
@@ -35,10 +40,16 @@ def get_image_provider(provider_name: str) -> BaseImageProvider:
         )
 
 
+@functools.lru_cache(maxsize=None)
 def get_video_provider(provider_name: str) -> BaseVideoProvider:
     """
     Factory function to get a video generation provider.
 
+    Providers hold no per-request state, so one instance per name is
+    shared across calls (and threads). The one exception is the Google
+    provider's cache of uploaded images, which is thread-safe and is
+    cleared at the end of a run with clear_uploads().
+
     Args:
         provider_name: Provider name (fal, together, google)
 
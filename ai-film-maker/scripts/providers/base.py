@@ -2,12 +2,36 @@
 """Abstract base classes for AI providers"""
 
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Mapping
+
+# Poll schedule for long-running generation jobs: the first check comes
+# after half a second, then the wait grows by 1.3x up to 30 seconds
+POLL_INITIAL_WAIT = 0.5
+POLL_BACKOFF = 1.3
+POLL_MAX_WAIT = 30.0
+
+# How often to print a "still generating" line while polling
+POLL_PROGRESS_INTERVAL = 60
+
+
+def poll_wait(attempt: int) -> float:
+    """Seconds to wait before status check number attempt (0-based)"""
+    return min(POLL_MAX_WAIT, POLL_INITIAL_WAIT * POLL_BACKOFF ** attempt)
 
 
 class BaseImageProvider(ABC):
     """Abstract base class for text-to-image providers"""
 
+    __slots__ = ()
+
+    # Model shorthand -> full model ID
+    MODELS: Mapping[str, str] = MappingProxyType({})
+
+    def _resolve_model(self, model: Optional[str]) -> str:
+        """Resolve model shorthand to full model ID (full IDs pass through)"""
+        return self.MODELS.get(model, model) if model else self.default_model
+
     @abstractmethod
     def generate_image(
         self,
@@ -48,6 +72,19 @@ class BaseImageProvider(ABC):
 class BaseVideoProvider(ABC):
     """Abstract base class for image-to-video providers"""
 
+    __slots__ = ()
+
+    # Model shorthand -> full model ID
+    MODELS: Mapping[str, str] = MappingProxyType({})
+
+    # True if generate_video accepts an image_url from upload_image, letting
+    # callers upload source images ahead of time
+    accepts_image_url = False
+
+    def _resolve_model(self, model: Optional[str]) -> str:
+        """Resolve model shorthand to full model ID (full IDs pass through)"""
+        return self.MODELS.get(model, model) if model else self.default_model
+
     @abstractmethod
     def generate_video(
         self,
@@ -86,6 +123,49 @@ class BaseVideoProvider(ABC):
         """Return the default model for this provider"""
         pass
 
+    def submit_video(
+        self,
+        image_path: str,
+        prompt: str,
+        duration: int = 5,
+        model: Optional[str] = None,
+        aspect_ratio: str = "16:9",
+        **kwargs
+    ) -> Any:
+        """
+        Start generating a video and return a handle for poll_video().
+
+        Override in providers with a job queue so callers can check on many
+        videos from one loop. By default the video is generated right here
+        and the handle is simply its URL.
+
+        Returns:
+            Handle to pass to poll_video()
+        """
+        return self.generate_video(
+            image_path, prompt, duration, model=model, aspect_ratio=aspect_ratio, **kwargs
+        )
+
+    def clear_uploads(self) -> None:
+        """
+        Forget images uploaded during a run.
+
+        Override in providers that cache uploads; callers call this when a
+        run ends, since the shared provider instance outlives it.
+        """
+
+    def poll_video(self, handle: Any) -> Optional[str]:
+        """
+        Check on a video started with submit_video().
+
+        Args:
+            handle: Handle returned by submit_video()
+
+        Returns:
+            URL of the generated video, or None while it is still generating
+        """
+        return handle
+
     def upload_image(self, image_path: str) -> str:
         """
         Upload an image to the provider's storage.
@@ -2,6 +2,7 @@
 """Fal.ai provider for image and video generation"""
 
 import os
+from types import MappingProxyType
 from typing import Optional
 
 try:
@@ -16,7 +17,9 @@ from .base import BaseImageProvider, BaseVideoProvider
 class FalImageProvider(BaseImageProvider):
     """Fal.ai text-to-image provider"""
 
-    MODELS = {
+    __slots__ = ()
+
+    MODELS = MappingProxyType({
         "flux-dev": "fal-ai/flux/dev",
         "flux-schnell": "fal-ai/flux/schnell",
         "flux-pro": "fal-ai/flux-pro",
@@ -25,7 +28,7 @@ class FalImageProvider(BaseImageProvider):
         "seedream-v4": "fal-ai/seedream-v4",
         "nano-banana-pro": "fal-ai/nano-banana-pro",
         "qwen-image": "fal-ai/qwen-image",
-    }
+    })
 
     def __init__(self):
         if not FAL_AVAILABLE:
@@ -45,14 +48,6 @@ class FalImageProvider(BaseImageProvider):
     def default_model(self) -> str:
         return self.MODELS["flux-dev"]
 
-    def _resolve_model(self, model: Optional[str]) -> str:
-        """Resolve model shorthand to full model ID"""
-        if model is None:
-            return self.default_model
-        if model in self.MODELS:
-            return self.MODELS[model]
-        return model
-
     def generate_image(
         self,
         prompt: str,
@@ -104,7 +99,11 @@ class FalImageProvider(BaseImageProvider):
 class FalVideoProvider(BaseVideoProvider):
     """Fal.ai image-to-video provider"""
 
-    MODELS = {
+    __slots__ = ()
+
+    accepts_image_url = True
+
+    MODELS = MappingProxyType({
         "wan-2.5": "fal-ai/wan-i2v",
         "wan-i2v": "fal-ai/wan-i2v",
         "kling-2.5-turbo": "fal-ai/kling-video/v2.5/turbo-pro/image-to-video",
@@ -114,7 +113,7 @@ class FalVideoProvider(BaseVideoProvider):
         "veo2": "fal-ai/veo2/image-to-video",
         "hunyuan-1.5": "fal-ai/hunyuan-video-v1.5/image-to-video",
         "ltx-2-19b": "fal-ai/ltx-2-19b/image-to-video",
-    }
+    })
 
     def __init__(self):
         if not FAL_AVAILABLE:
@@ -134,25 +133,18 @@ class FalVideoProvider(BaseVideoProvider):
     def default_model(self) -> str:
         return self.MODELS["kling-2.5-turbo"]
 
-    def _resolve_model(self, model: Optional[str]) -> str:
-        """Resolve model shorthand to full model ID"""
-        if model is None:
-            return self.default_model
-        if model in self.MODELS:
-            return self.MODELS[model]
-        return model
-
-    def generate_video(
+    def submit_video(
         self,
         image_path: str,
         prompt: str,
         duration: int = 5,
         model: Optional[str] = None,
         aspect_ratio: str = "16:9",
+        image_url: Optional[str] = None,
         **kwargs
-    ) -> str:
+    ):
         """
-        Generate video from image using Fal.ai.
+        Queue a video on Fal.ai without waiting for it.
 
         Args:
             image_path: Path to the source image
@@ -160,18 +152,20 @@ class FalVideoProvider(BaseVideoProvider):
             duration: Video duration in seconds
             model: Model name or shorthand
             aspect_ratio: Output aspect ratio
+            image_url: Fal storage URL of the already uploaded image
 
         Returns:
-            URL of the generated video
+            Fal request handle
         """
         resolved_model = self._resolve_model(model)
         print(f"  Using Fal.ai {resolved_model}...")
         print(f"  Generating {duration}s video: {prompt[:50]}...")
 
-        # Upload image to fal storage
-        image_url = fal_client.upload_file(image_path)
+        # Upload image to fal storage unless the caller already did
+        if image_url is None:
+            image_url = fal_client.upload_file(image_path)
 
-        result = fal_client.subscribe(
+        return fal_client.submit(
             resolved_model,
             arguments={
                 "image_url": image_url,
@@ -179,10 +173,52 @@ class FalVideoProvider(BaseVideoProvider):
                 "duration": str(duration),
                 "aspect_ratio": aspect_ratio,
                 **kwargs
-            },
-            with_logs=True
+            }
+        )
+
+    def poll_video(self, handle) -> Optional[str]:
+        """Check a queued Fal.ai request, returning the video URL once it completes"""
+        if not isinstance(handle.status(), fal_client.Completed):
+            return None
+        return self._get_video_url(handle.get())
+
+    def generate_video(
+        self,
+        image_path: str,
+        prompt: str,
+        duration: int = 5,
+        model: Optional[str] = None,
+        aspect_ratio: str = "16:9",
+        image_url: Optional[str] = None,
+        **kwargs
+    ) -> str:
+        """
+        Generate video from image using Fal.ai.
+
+        Args:
+            image_path: Path to the source image
+            prompt: Motion/animation description
+            duration: Video duration in seconds
+            model: Model name or shorthand
+            aspect_ratio: Output aspect ratio
+            image_url: Fal storage URL of the already uploaded image
+
+        Returns:
+            URL of the generated video
+        """
+        handle = self.submit_video(
+            image_path,
+            prompt,
+            duration,
+            model=model,
+            aspect_ratio=aspect_ratio,
+            image_url=image_url,
+            **kwargs
         )
+        return self._get_video_url(handle.get())
 
+    def _get_video_url(self, result: dict) -> str:
+        """Extract the video URL from a Fal.ai result"""
         # Handle different response formats
         if "video" in result:
             if isinstance(result["video"], dict) and "url" in result["video"]:
@@ -4,6 +4,8 @@
 import os
 import time
 import base64
+import threading
+from types import MappingProxyType
 from typing import Optional
 
 try:
@@ -13,19 +15,26 @@ try:
 except ImportError:
     GOOGLE_AVAILABLE = False
 
-from .base import BaseVideoProvider
+from utils import is_rejected_submission, read_image, retry
+from .base import BaseVideoProvider, poll_wait, POLL_PROGRESS_INTERVAL
+
+# Google keeps uploaded files for 48 hours; an upload is reused for a little
+# less than that so a handle never expires while a clip is generating
+UPLOAD_REUSE_SECONDS = 47 * 60 * 60
 
 
 class GoogleVideoProvider(BaseVideoProvider):
     """Google AI Studio Veo video generation provider"""
 
-    MODELS = {
+    __slots__ = ("client", "_uploads", "_upload_locks", "_uploads_lock")
+
+    MODELS = MappingProxyType({
         "veo-2": "veo-2.0-generate-001",
         "veo-3": "veo-3.0-generate-001",
         "veo-3-fast": "veo-3.0-fast-generate-001",
         "veo-3.1": "veo-3.1-generate-preview",
         "veo-3.1-fast": "veo-3.1-fast-generate-preview",
-    }
+    })
 
     def __init__(self):
         if not GOOGLE_AVAILABLE:
@@ -43,6 +52,13 @@ class GoogleVideoProvider(BaseVideoProvider):
         genai.configure(api_key=api_key)
         self.client = genai.Client()
 
+        # Uploaded files (and when they were uploaded) by image digest, so an
+        # image used for several clips (or retried) is uploaded and processed
+        # only once per run; see clear_uploads()
+        self._uploads = {}
+        self._upload_locks = {}
+        self._uploads_lock = threading.Lock()
+
     @property
     def provider_name(self) -> str:
         return "google"
@@ -51,16 +67,6 @@ class GoogleVideoProvider(BaseVideoProvider):
     def default_model(self) -> str:
         return self.MODELS["veo-2"]
 
-    def _resolve_model(self, model: Optional[str]) -> str:
-        """Resolve model shorthand to full model ID"""
-        if model is None:
-            return self.default_model
-        # Check if it's a shorthand
-        if model in self.MODELS:
-            return self.MODELS[model]
-        # Assume it's already a full model ID
-        return model
-
     def generate_video(
         self,
         image_path: str,
@@ -86,25 +92,17 @@ class GoogleVideoProvider(BaseVideoProvider):
         resolved_model = self._resolve_model(model)
         print(f"  Using Google {resolved_model}...")
 
-        # Read and encode image
-        with open(image_path, "rb") as f:
-            image_data = f.read()
-
-        # Upload image to Google
-        image_file = genai.upload_file(path=image_path)
-
-        # Wait for file to be ready
-        while image_file.state.name == "PROCESSING":
-            time.sleep(2)
-            image_file = genai.get_file(image_file.name)
-
-        if image_file.state.name != "ACTIVE":
-            raise Exception(f"Image upload failed: {image_file.state.name}")
+        image_file = self._get_uploaded_file(image_path)
 
         # Generate video
         print(f"  Generating {duration}s video: {prompt[:50]}...")
 
-        operation = self.client.models.generate_videos(
+        # Starting a job is billed, so it is only resent when the request
+        # was certainly rejected (see is_rejected_submission)
+        generate_videos = retry(should_retry=is_rejected_submission)(
+            self.client.models.generate_videos
+        )
+        operation = generate_videos(
             model=resolved_model,
             prompt=prompt,
             image=image_file,
@@ -115,15 +113,21 @@ class GoogleVideoProvider(BaseVideoProvider):
             )
         )
 
-        # Poll for completion
+        # Poll for completion; ResourceExhausted (429) and ServiceUnavailable
+        # (503) while checking on the operation are retried, not fatal
+        get_operation = retry()(self.client.operations.get)
         print("  Waiting for video generation...")
+        start = time.monotonic()
+        next_progress = POLL_PROGRESS_INTERVAL
         poll_count = 0
         while not operation.done:
-            time.sleep(10)
+            time.sleep(poll_wait(poll_count))
             poll_count += 1
-            if poll_count % 6 == 0:  # Every minute
-                print(f"  Still generating... ({poll_count * 10}s elapsed)")
-            operation = self.client.operations.get(operation.name)
+            elapsed = time.monotonic() - start
+            if elapsed >= next_progress:  # Every minute
+                print(f"  Still generating... ({elapsed:.0f}s elapsed)")
+                next_progress += POLL_PROGRESS_INTERVAL
+            operation = get_operation(operation.name)
 
         if operation.error:
             raise Exception(f"Video generation failed: {operation.error}")
@@ -139,11 +143,46 @@ class GoogleVideoProvider(BaseVideoProvider):
 
     def upload_image(self, image_path: str) -> str:
         """Upload image to Google's storage"""
-        image_file = genai.upload_file(path=image_path)
+        return self._get_uploaded_file(image_path).uri
+
+    def clear_uploads(self) -> None:
+        """Forget the images uploaded so far"""
+        with self._uploads_lock:
+            self._uploads.clear()
+            self._upload_locks.clear()
+
+    def _get_uploaded_file(self, image_path: str):
+        """
+        Upload an image and wait until it is ready, reusing an earlier
+        upload of the same contents unless it is close to expiring.
+
+        Returns:
+            Google File handle
+        """
+        digest = read_image(image_path)[2]
+
+        # Per-image lock, held across the upload so two clips sharing an
+        # image don't both upload it while different images upload in parallel
+        with self._uploads_lock:
+            upload_lock = self._upload_locks.setdefault(digest, threading.Lock())
+
+        with upload_lock:
+            upload = self._uploads.get(digest)
+            if upload is not None and time.monotonic() - upload[1] < UPLOAD_REUSE_SECONDS:
+                return upload[0]
+
+            # Upload image to Google
+            image_file = retry()(genai.upload_file)(path=image_path)
+
+            # Wait for file to be ready
+            poll_count = 0
+            while image_file.state.name == "PROCESSING":
+                time.sleep(poll_wait(poll_count))
+                poll_count += 1
+                image_file = genai.get_file(image_file.name)
 
-        # Wait for processing
-        while image_file.state.name == "PROCESSING":
-            time.sleep(2)
-            image_file = genai.get_file(image_file.name)
+            if image_file.state.name != "ACTIVE":
+                raise Exception(f"Image upload failed: {image_file.state.name}")
 
-        return image_file.uri
+            self._uploads[digest] = (image_file, time.monotonic())
+            return image_file
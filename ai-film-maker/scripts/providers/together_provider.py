@@ -3,30 +3,45 @@
 
 import os
 import time
-import base64
 import requests
+from requests.adapters import HTTPAdapter
+from types import MappingProxyType
 from typing import Optional
 
-from .base import BaseImageProvider, BaseVideoProvider
+from utils import encode_image_data_url, is_rejected_submission, retry
+from .base import BaseImageProvider, BaseVideoProvider, poll_wait, POLL_PROGRESS_INTERVAL
 
 
+def create_session(api_key: str) -> requests.Session:
+    """Create a keep-alive session that sends the Together AI auth headers"""
+    session = requests.Session()
+    session.headers.update({
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    })
+    session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16))
+    return session
+
 class TogetherImageProvider(BaseImageProvider):
     """Together AI text-to-image provider"""
 
-    MODELS = {
+    __slots__ = ("api_key", "base_url", "session")
+
+    MODELS = MappingProxyType({
         "qwen-image": "Qwen/Qwen2.5-VL-72B-Instruct",
         "nano-banana": "black-forest-labs/FLUX.1-schnell",
         "flux-schnell": "black-forest-labs/FLUX.1-schnell",
         "flux-dev": "black-forest-labs/FLUX.1-dev",
         "flux-pro": "black-forest-labs/FLUX.1.1-pro",
         "imagen-4-ultra": "google/imagen-4-ultra",
-    }
+    })
 
     def __init__(self):
         self.api_key = os.environ.get("TOGETHER_API_KEY")
         if not self.api_key:
             raise ValueError("TOGETHER_API_KEY environment variable not set")
         self.base_url = "https://api.together.ai/v1"
+        self.session = create_session(self.api_key)
 
     @property
     def provider_name(self) -> str:
@@ -36,14 +51,6 @@ class TogetherImageProvider(BaseImageProvider):
     def default_model(self) -> str:
         return self.MODELS["qwen-image"]
 
-    def _resolve_model(self, model: Optional[str]) -> str:
-        """Resolve model shorthand to full model ID"""
-        if model is None:
-            return self.default_model
-        if model in self.MODELS:
-            return self.MODELS[model]
-        return model
-
     def generate_image(
         self,
         prompt: str,
@@ -67,12 +74,8 @@ class TogetherImageProvider(BaseImageProvider):
         resolved_model = self._resolve_model(model)
         print(f"  Using Together AI {resolved_model}...")
 
-        response = requests.post(
+        response = self.session.post(
             f"{self.base_url}/images/generations",
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            },
             json={
                 "model": resolved_model,
                 "prompt": prompt,
@@ -85,7 +88,10 @@ class TogetherImageProvider(BaseImageProvider):
         )
 
         if response.status_code != 200:
-            raise Exception(f"Together AI error: {response.status_code} - {response.text}")
+            raise requests.HTTPError(
+                f"Together AI error: {response.status_code} - {response.text}",
+                response=response
+            )
 
         result = response.json()
         if "data" in result and len(result["data"]) > 0:
@@ -97,20 +103,25 @@ class TogetherImageProvider(BaseImageProvider):
 class TogetherVideoProvider(BaseVideoProvider):
     """Together AI image-to-video provider"""
 
-    MODELS = {
+    __slots__ = ("api_key", "base_url", "session")
+
+    accepts_image_url = True
+
+    MODELS = MappingProxyType({
         "pixverse-v5": "pixverse/pixverse-v5",
         "hailuo": "minimax/hailuo",
         "seedance-1-pro": "bytedance/seedance-1.0-pro",
         "veo-3": "google/veo-3.0",
         "sora-2-pro": "openai/sora-2-pro",
         "kling-v2.1": "kuaishou/kling-v2.1",
-    }
+    })
 
     def __init__(self):
         self.api_key = os.environ.get("TOGETHER_API_KEY")
         if not self.api_key:
             raise ValueError("TOGETHER_API_KEY environment variable not set")
         self.base_url = "https://api.together.ai/v1"
+        self.session = create_session(self.api_key)
 
     @property
     def provider_name(self) -> str:
@@ -120,25 +131,18 @@ class TogetherVideoProvider(BaseVideoProvider):
     def default_model(self) -> str:
         return self.MODELS["pixverse-v5"]
 
-    def _resolve_model(self, model: Optional[str]) -> str:
-        """Resolve model shorthand to full model ID"""
-        if model is None:
-            return self.default_model
-        if model in self.MODELS:
-            return self.MODELS[model]
-        return model
-
-    def generate_video(
+    def submit_video(
         self,
         image_path: str,
         prompt: str,
         duration: int = 5,
         model: Optional[str] = None,
         aspect_ratio: str = "16:9",
+        image_url: Optional[str] = None,
         **kwargs
-    ) -> str:
+    ) -> dict:
         """
-        Generate video from image using Together AI.
+        Start a Together AI video job without waiting for it.
 
         Args:
             image_path: Path to the source image
@@ -146,34 +150,22 @@ class TogetherVideoProvider(BaseVideoProvider):
             duration: Video duration in seconds
             model: Model name or shorthand
             aspect_ratio: Output aspect ratio
+            image_url: Data URL from upload_image(), if already encoded
 
         Returns:
-            URL of the generated video
+            The job response, to pass to poll_video()
         """
         resolved_model = self._resolve_model(model)
         print(f"  Using Together AI {resolved_model}...")
 
-        # Read and encode image as base64
-        with open(image_path, "rb") as f:
-            image_data = base64.b64encode(f.read()).decode("utf-8")
-
-        # Determine mime type
-        if image_path.lower().endswith(".png"):
-            mime_type = "image/png"
-        else:
-            mime_type = "image/jpeg"
-
-        image_url = f"data:{mime_type};base64,{image_data}"
+        if image_url is None:
+            image_url = self.upload_image(image_path)
 
         print(f"  Generating {duration}s video: {prompt[:50]}...")
 
         # Start video generation
-        response = requests.post(
+        response = self.session.post(
             f"{self.base_url}/videos/generations",
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            },
             json={
                 "model": resolved_model,
                 "prompt": prompt,
@@ -184,62 +176,106 @@ class TogetherVideoProvider(BaseVideoProvider):
         )
 
         if response.status_code != 200:
-            raise Exception(f"Together AI error: {response.status_code} - {response.text}")
+            raise requests.HTTPError(
+                f"Together AI error: {response.status_code} - {response.text}",
+                response=response
+            )
+
+        return response.json()
+
+    def poll_video(self, handle: dict) -> Optional[str]:
+        """Check a Together AI video job, returning the video URL once it completes"""
+        # Some models answer the submit request with the finished video
+        if "data" in handle and len(handle["data"]) > 0:
+            return handle["data"][0]["url"]
+
+        if not ("id" in handle and "status" in handle):
+            raise Exception(f"Unexpected response format: {handle}")
+
+        response = self.session.get(f"{self.base_url}/videos/generations/{handle['id']}")
+
+        if response.status_code != 200:
+            raise requests.HTTPError(
+                f"Polling error: {response.status_code} - {response.text}",
+                response=response
+            )
 
         result = response.json()
+        status = result.get("status", "unknown")
 
-        # Check if it's an async operation
-        if "id" in result and "status" in result:
-            return self._poll_for_completion(result["id"])
+        if status == "completed":
+            if "data" in result and len(result["data"]) > 0:
+                return result["data"][0]["url"]
+            raise Exception(f"Completed but no video URL: {result}")
 
-        # Direct result
-        if "data" in result and len(result["data"]) > 0:
-            return result["data"][0]["url"]
+        if status == "failed":
+            raise Exception(f"Video generation failed: {result.get('error', 'Unknown error')}")
 
-        raise Exception(f"Unexpected response format: {result}")
+        return None
+
+    def generate_video(
+        self,
+        image_path: str,
+        prompt: str,
+        duration: int = 5,
+        model: Optional[str] = None,
+        aspect_ratio: str = "16:9",
+        image_url: Optional[str] = None,
+        **kwargs
+    ) -> str:
+        """
+        Generate video from image using Together AI.
+
+        Args:
+            image_path: Path to the source image
+            prompt: Motion/animation description
+            duration: Video duration in seconds
+            model: Model name or shorthand
+            aspect_ratio: Output aspect ratio
+            image_url: Data URL from upload_image(), if already encoded
 
-    def _poll_for_completion(self, job_id: str) -> str:
+        Returns:
+            URL of the generated video
+        """
+        handle = retry(should_retry=is_rejected_submission)(self.submit_video)(
+            image_path,
+            prompt,
+            duration,
+            model=model,
+            aspect_ratio=aspect_ratio,
+            image_url=image_url,
+            **kwargs
+        )
+        return self._poll_for_completion(handle)
+
+    def _poll_for_completion(self, handle: dict) -> str:
         """Poll for async video generation completion"""
+        poll_video = retry()(self.poll_video)
+        video_url = poll_video(handle)
+        if video_url:
+            return video_url
+
         print("  Waiting for video generation...")
+        start = time.monotonic()
+        next_progress = POLL_PROGRESS_INTERVAL
         poll_count = 0
 
         while True:
-            time.sleep(10)
+            time.sleep(poll_wait(poll_count))
             poll_count += 1
+            elapsed = time.monotonic() - start
 
-            response = requests.get(
-                f"{self.base_url}/videos/generations/{job_id}",
-                headers={"Authorization": f"Bearer {self.api_key}"}
-            )
-
-            if response.status_code != 200:
-                raise Exception(f"Polling error: {response.status_code} - {response.text}")
-
-            result = response.json()
-            status = result.get("status", "unknown")
-
-            if status == "completed":
-                if "data" in result and len(result["data"]) > 0:
-                    return result["data"][0]["url"]
-                raise Exception(f"Completed but no video URL: {result}")
+            video_url = poll_video(handle)
+            if video_url:
+                return video_url
 
-            if status == "failed":
-                raise Exception(f"Video generation failed: {result.get('error', 'Unknown error')}")
+            if elapsed >= next_progress:
+                print(f"  Still generating... ({elapsed:.0f}s elapsed)")
+                next_progress += POLL_PROGRESS_INTERVAL
 
-            if poll_count % 6 == 0:
-                print(f"  Still generating... ({poll_count * 10}s elapsed)")
-
-            if poll_count > 60:  # 10 minute timeout
+            if elapsed > 600:  # 10 minute timeout
                 raise Exception("Video generation timed out")
 
     def upload_image(self, image_path: str) -> str:
         """Encode image as base64 data URL"""
-        with open(image_path, "rb") as f:
-            image_data = base64.b64encode(f.read()).decode("utf-8")
-
-        if image_path.lower().endswith(".png"):
-            mime_type = "image/png"
-        else:
-            mime_type = "image/jpeg"
-
-        return f"data:{mime_type};base64,{image_data}"
+        return encode_image_data_url(image_path)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Run the full asset pipeline: images, narration and music in parallel, then videos and composition"""
+
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import load_scene_json, save_scene_json
+from generate_images import generate_scene_images
+from generate_narration import generate_scene_narration
+from generate_music import generate_scene_music
+import generate_videos
+import compose_video
+
+# Stages that only depend on scene.json and can run at the same time
+ASSET_STAGES = {
+    'images': generate_scene_images,
+    'narration': generate_scene_narration,
+    'music': generate_scene_music,
+}
+
+
+def generate_assets(json_path: str) -> dict:
+    """
+    Generate images, narration and music concurrently.
+
+    The stages update disjoint sections of the scene data, so they share a
+    single in-memory copy. Each stage checkpoints it to disk as it makes
+    progress, and it is saved again when they finish or are interrupted.
+
+    Args:
+        json_path: Path to the scene.json file
+
+    Returns:
+        Dictionary of stage name -> exception for stages that failed
+    """
+    data = load_scene_json(json_path)
+    errors = {}
+
+    # Stages checkpoint from their own threads; one save at a time, since
+    # saves share a temp file
+    save_lock = threading.Lock()
+
+    def checkpoint() -> None:
+        with save_lock:
+            save_scene_json(json_path, data)
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(ASSET_STAGES)) as executor:
+            futures = {
+                name: executor.submit(stage, data, checkpoint=checkpoint)
+                for name, stage in ASSET_STAGES.items()
+            }
+
+            for name, future in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    errors[name] = e
+    finally:
+        with save_lock:
+            save_scene_json(json_path, data, pretty=True)
+
+    return errors
+
+
+def run_pipeline(json_path: str) -> None:
+    """Run every generation stage and compose the final video"""
+    errors = generate_assets(json_path)
+
+    if errors:
+        print("\n" + "=" * 50)
+        print("Asset generation failed:")
+        for name, error in errors.items():
+            print(f"  {name}: {error}")
+        print("\nFix the errors above and re-run, or run the failed stage on its own.")
+        sys.exit(1)
+
+    generate_videos.process_scene_json(json_path)
+    compose_video.process_scene_json(json_path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python run_pipeline.py <scene.json>")
+        print("\nRuns generate_images, generate_narration and generate_music in parallel,")
+        print("then generate_videos and compose_video.")
+        sys.exit(1)
+
+    json_path = sys.argv[1]
+    run_pipeline(json_path)
@@ -1,61 +1,381 @@
 #!/usr/bin/env python3
 """Shared utilities for AI Film Maker scripts"""
 
+import base64
+import functools
+import hashlib
 import json
+import mimetypes
 import os
+import random
 import re
+import shutil
+import subprocess
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import MappingProxyType
+from requests.adapters import HTTPAdapter
+from typing import Any, Callable, Iterable, List, Mapping, Optional, Tuple
 
+# orjson is a much faster drop-in for scene.json round-trips; fall back to json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Read size for streaming downloads to disk
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Parallel connections used by download_files
+MAX_CONCURRENT_DOWNLOADS = 6
+
+# Shared HTTP session so downloads reuse keep-alive connections to the CDNs
+# instead of paying a TCP + TLS handshake per file
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+
+# Top-level fields every scene.json must have
+REQUIRED_SCENE_FIELDS = frozenset({'title', 'scenes', 'narration', 'config'})
+
+# HTTP status codes worth retrying (rate limits and transient server errors)
+TRANSIENT_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+# HTTP status codes that reject a request before it is accepted (rate limits
+# and overload), so a job submission that got one never started a job
+REJECTED_STATUS_CODES = frozenset({429, 503})
+
+# Patterns used by slugify
+_SLUG_INVALID_RE = re.compile(r'[^a-z0-9\s-]')
+_SLUG_SEPARATOR_RE = re.compile(r'[\s_]+')
+_SLUG_DASHES_RE = re.compile(r'-+')
+
+@functools.lru_cache(maxsize=1024)
 def slugify(title: str) -> str:
     """Convert title to URL-friendly slug"""
     slug = title.lower()
-    slug = re.sub(r'[^a-z0-9\s-]', '', slug)
-    slug = re.sub(r'[\s_]+', '-', slug)
-    slug = re.sub(r'-+', '-', slug)
+    slug = _SLUG_INVALID_RE.sub('', slug)
+    slug = _SLUG_SEPARATOR_RE.sub('-', slug)
+    slug = _SLUG_DASHES_RE.sub('-', slug)
     return slug.strip('-')
 
 def load_scene_json(path: str) -> dict:
     """Load and validate scene JSON"""
-    with open(path, 'r') as f:
-        data = json.load(f)
+    with open(path, 'rb') as f:
+        data = parse_json(f.read())
 
-    required_fields = ['title', 'scenes', 'narration', 'config']
-    for field in required_fields:
-        if field not in data:
-            raise ValueError(f"Missing required field: {field}")
+    missing = REQUIRED_SCENE_FIELDS - data.keys()
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(sorted(missing))}")
 
     return data
 
-def save_scene_json(path: str, data: dict) -> None:
-    """Save updated JSON"""
-    with open(path, 'w') as f:
-        json.dump(data, f, indent=2)
+def dump_json_bytes(data: Any, pretty: bool = False) -> bytes:
+    """Serialize data as compact (or 2-space indented) JSON, using orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None)
+    # ensure_ascii=False writes titles and narration as UTF-8, like orjson does
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def parse_json(text) -> Any:
+    """Parse a JSON string or bytes, using orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def write_json_atomic(path: str, data: Any, pretty: bool = False) -> None:
+    """Write JSON to a temp file and rename it over the target"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(dump_json_bytes(data, pretty))
+    os.replace(tmp_path, path)
+
+def save_scene_json(path: str, data: dict, pretty: bool = False) -> None:
+    """
+    Save updated JSON (atomically, so an interrupted save never truncates it).
+
+    Progress checkpoints are written compact; pass pretty=True for the final
+    save of a stage so the file stays readable for hand edits.
+    """
+    write_json_atomic(path, data, pretty)
+
+def append_ndjson(path: str, record: dict) -> None:
+    """Append one JSON record as a line to an NDJSON log"""
+    with open(path, 'ab') as f:
+        f.write(dump_json_bytes(record) + b'\n')
+
+def write_ndjson(path: str, records) -> None:
+    """Rewrite an NDJSON log atomically with the given records"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        for record in records:
+            f.write(dump_json_bytes(record) + b'\n')
+    os.replace(tmp_path, path)
+
+def hash_file(path: str) -> str:
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def hash_text(text: str) -> str:
+    """Return the SHA-256 hex digest of a string"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def detect_mime(data: bytes) -> Optional[str]:
+    """Identify PNG, JPEG, WebP and GIF images from their leading bytes"""
+    if data[:8] == b'\x89PNG\r\n\x1a\n':
+        return 'image/png'
+    if data[:3] == b'\xff\xd8\xff':
+        return 'image/jpeg'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'image/webp'
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        return 'image/gif'
+    return None
+
+@functools.lru_cache(maxsize=16)
+def _read_image(path: str, mtime_ns: int) -> Tuple[bytes, str, str]:
+    with open(path, 'rb') as f:
+        data = f.read()
+    # Trust the file contents over the extension (seed images get renamed)
+    mime_type = detect_mime(data) or mimetypes.guess_type(path)[0] or 'image/jpeg'
+    return data, mime_type, hashlib.sha256(data).hexdigest()
+
+def read_image(path: str) -> Tuple[bytes, str, str]:
+    """
+    Read an image file once for hashing, encoding and uploading.
+
+    Results are cached per path and modification time, so an image used by
+    several requests (e.g. the avatar, or a frame sent to hedged routes) is
+    only read from disk once.
+
+    Returns:
+        Tuple of (contents, MIME type, SHA-256 hex digest); the digest
+        matches hash_file(path)
+    """
+    return _read_image(path, os.stat(path).st_mtime_ns)
+
+@functools.lru_cache(maxsize=16)
+def _encode_data_url(path: str, mtime_ns: int) -> str:
+    data, mime_type, _ = read_image(path)
+    return f"data:{mime_type};base64,{base64.b64encode(data).decode('ascii')}"
+
+def encode_image_data_url(path: str) -> str:
+    """
+    Encode an image file as a base64 data URL.
+
+    Results are cached per path and modification time, so an image sent
+    with many requests (e.g. the avatar) is only encoded once.
+    """
+    return _encode_data_url(path, os.stat(path).st_mtime_ns)
+
+def get_cache_dir(base_dir: str) -> str:
+    """Get the cache directory shared by all films under an output directory"""
+    return os.path.join(base_dir, '.cache')
+
+def link_or_copy(src: str, dst: str) -> None:
+    """
+    Hard-link src to dst (copying if linking is not possible), replacing dst.
+
+    Safe to call from worker threads with the same dst: each call stages
+    its link under its own temp name, so one never removes another's.
+    """
+    os.makedirs(os.path.dirname(dst) or '.', exist_ok=True)
+    tmp_path = f"{dst}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        try:
+            os.link(src, tmp_path)
+        except OSError:
+            shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+    finally:
+        # Left behind on failure, or when dst was already a link to src
+        # (renaming a file over another link to it is a no-op)
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+
+def _error_status_code(error: Exception) -> Optional[int]:
+    """Extract an HTTP status code from an SDK or requests exception"""
+    response = getattr(error, 'response', None)
+    for source in (error, response):
+        for attr in ('status_code', 'status', 'code'):
+            value = getattr(source, attr, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read the Retry-After header (in seconds) from a failed response"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+def is_transient_error(error: Exception) -> bool:
+    """Check whether an API error is worth retrying"""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    return _error_status_code(error) in TRANSIENT_STATUS_CODES
+
+def is_rejected_submission(error: Exception) -> bool:
+    """
+    Check whether a failed job submission is safe to send again.
+
+    Submitting starts a billed job, so only failures where the server
+    cannot have accepted the request qualify: no connection, or a rate
+    limit/overload response. Timeouts and other server errors may follow
+    an accepted job and are not retried.
+    """
+    if isinstance(error, (ConnectionError, requests.ConnectionError)):
+        return True
+    return _error_status_code(error) in REJECTED_STATUS_CODES
 
-def download_file(url: str, output_path: str) -> str:
-    """Download file from URL"""
-    response = requests.get(url, stream=True)
-    response.raise_for_status()
+def retry(
+    max_attempts: int = 6,
+    initial_wait: float = 2.0,
+    max_wait: float = 60.0,
+    should_retry: Callable[[Exception], bool] = is_transient_error
+) -> Callable:
+    """
+    Retry a remote API call on rate limits and transient errors.
 
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    Waits with exponential backoff plus jitter between attempts, honouring
+    the Retry-After header when the server sends one.
 
-    with open(output_path, 'wb') as f:
-        for chunk in response.iter_content(chunk_size=8192):
-            f.write(chunk)
+    Args:
+        max_attempts: Total number of attempts before giving up
+        initial_wait: Wait before the first retry in seconds
+        max_wait: Upper bound for a single wait in seconds
+        should_retry: Decides which errors are retried; pass
+            is_rejected_submission for calls that start a billed job
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    if attempt == max_attempts or not should_retry(e):
+                        raise
+
+                    wait = _retry_after_seconds(e)
+                    if wait is None:
+                        wait = initial_wait * 2 ** (attempt - 1) + random.uniform(0, initial_wait)
+                    wait = min(wait, max_wait)
+
+                    print(f"  {func.__name__} failed ({e}), retrying in {wait:.1f}s "
+                          f"(attempt {attempt + 1}/{max_attempts})...")
+                    time.sleep(wait)
+        return wrapper
+    return decorator
+
+@retry()
+def download_file(
+    url: str,
+    output_path: str,
+    session: Optional[requests.Session] = None
+) -> str:
+    """
+    Download file from URL, streaming it straight to disk.
+
+    The body goes to a .part file that is renamed into place once complete,
+    so an interrupted download never leaves a truncated file at output_path.
+    Dropped connections and 429/5xx responses are retried.
+
+    The response's ETag is kept in a sibling .etag file; downloading the
+    same URL again sends it as If-None-Match and keeps the existing file
+    if the server answers 304 Not Modified.
+
+    Args:
+        url: URL to download
+        output_path: Where to save the file
+        session: Session to download with (defaults to the shared HTTP_SESSION)
+    """
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    part_path = f"{output_path}.part"
+    etag_path = f"{output_path}.etag"
+
+    headers = {}
+    if os.path.exists(output_path) and os.path.exists(etag_path):
+        with open(etag_path, 'r') as f:
+            saved_url, _, etag = f.read().partition('\n')
+        if saved_url == url and etag:
+            headers['If-None-Match'] = etag
+
+    try:
+        with (session or HTTP_SESSION).get(url, stream=True, headers=headers) as response:
+            if response.status_code == 304:
+                return output_path
+            response.raise_for_status()
+            response.raw.decode_content = True
+
+            with open(part_path, 'wb') as f:
+                shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+            etag = response.headers.get('ETag')
+
+        os.replace(part_path, output_path)
+    finally:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+    if etag:
+        with open(etag_path, 'w') as f:
+            f.write(f"{url}\n{etag}")
+    elif os.path.exists(etag_path):
+        os.remove(etag_path)
 
     return output_path
 
-def get_output_dirs(base_dir: str, film_slug: str) -> dict:
-    """Get output directory paths for a film"""
+def download_files(
+    items: Iterable[Tuple[str, str]],
+    max_workers: int = MAX_CONCURRENT_DOWNLOADS
+) -> List[str]:
+    """
+    Download several files at once over the shared session.
+
+    Args:
+        items: (url, output_path) pairs
+        max_workers: Number of downloads running at the same time
+
+    Returns:
+        Output paths, in the order of items
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda item: download_file(*item), items))
+
+@functools.lru_cache(maxsize=32)
+def get_output_dirs(base_dir: str, film_slug: str) -> Mapping[str, str]:
+    """
+    Get output directory paths for a film.
+
+    Paths stay plain strings since they are written into scene.json. The
+    mapping is built once per film and shared, so it is read-only.
+    """
     film_dir = os.path.join(base_dir, film_slug)
-    return {
+    return MappingProxyType({
         'base': film_dir,
         'images': os.path.join(film_dir, 'images'),
         'videos': os.path.join(film_dir, 'videos'),
         'audio': os.path.join(film_dir, 'audio'),
-    }
+    })
 
-def ensure_output_dirs(base_dir: str, film_slug: str) -> dict:
+def ensure_output_dirs(base_dir: str, film_slug: str) -> Mapping[str, str]:
     """Create output directories for a film"""
     dirs = get_output_dirs(base_dir, film_slug)
 
@@ -81,37 +401,83 @@ def get_final_video_path(dirs: dict, film_slug: str) -> str:
     """Get path for final composed video"""
     return os.path.join(dirs['videos'], f"{film_slug}.mp4")
 
-def create_scene_json_template(title: str, base_dir: str = "OUTPUT") -> dict:
-    """Create a new scene JSON template"""
+def get_ffmpeg_log_path(dirs: dict) -> str:
+    """Get path for the film's ffmpeg log"""
+    return os.path.join(dirs['base'], 'ffmpeg.log')
+
+def run_ffmpeg(args: list, log_path: Optional[str] = None, quiet: bool = False) -> None:
+    """
+    Run ffmpeg, appending its warnings and errors to a log file.
+
+    stderr goes straight to the log instead of being buffered in memory.
+
+    Args:
+        args: ffmpeg arguments (without the leading 'ffmpeg')
+        log_path: Log file to append to (None discards ffmpeg's output)
+        quiet: Don't report a failure on the console, for attempts the
+            caller expects may fail and handles itself
+
+    Raises:
+        subprocess.CalledProcessError: If ffmpeg exits with an error
+    """
+    cmd = ['ffmpeg', '-y', '-hide_banner', '-loglevel', 'warning', '-nostats', *args]
+
+    if log_path is None:
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return
+
+    os.makedirs(os.path.dirname(log_path) or '.', exist_ok=True)
+    with open(log_path, 'ab') as log:
+        log.write(f"$ {subprocess.list2cmdline(cmd)}\n".encode())
+        log.flush()
+        try:
+            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=log)
+        except subprocess.CalledProcessError:
+            if not quiet:
+                print(f"  ffmpeg failed, see {log_path}")
+            raise
+
+# Default "config" section for new scene.json files
+DEFAULT_SCENE_CONFIG = MappingProxyType({
+    "voiceId": "am_adam",
+    "voiceSpeed": 1.0,
+    "musicPrompt": "Epic cinematic orchestral soundtrack",
+    "musicVolume": 0.2,
+    "narrationVolume": 1.0
+})
+
+@functools.lru_cache(maxsize=64)
+def _template_paths(title: str, base_dir: str) -> Tuple[Mapping[str, str], str]:
+    """Get a template's (output section, narration path), built once per title"""
     film_slug = slugify(title)
     dirs = get_output_dirs(base_dir, film_slug)
+    output = MappingProxyType({
+        "filmSlug": film_slug,
+        "baseDir": base_dir,
+        "imagesDir": dirs['images'],
+        "videosDir": dirs['videos'],
+        "audioDir": dirs['audio'],
+        "finalVideo": get_final_video_path(dirs, film_slug)
+    })
+    return output, get_audio_path(dirs, "narration.mp3")
+
+def create_scene_json_template(title: str, base_dir: str = "OUTPUT") -> dict:
+    """Create a new scene JSON template"""
+    output, narration_path = _template_paths(title, base_dir)
 
     return {
         "title": title,
         "totalDuration": 30,
         "avatarPath": "IMAGES/avatar/avatar.jpg",
-        "config": {
-            "voiceId": "am_adam",
-            "voiceSpeed": 1.0,
-            "musicPrompt": "Epic cinematic orchestral soundtrack",
-            "musicVolume": 0.2,
-            "narrationVolume": 1.0
-        },
+        "config": dict(DEFAULT_SCENE_CONFIG),
         "narration": {
             "text": "",
-            "audioPath": get_audio_path(dirs, "narration.mp3"),
-            "voice": "am_adam",
-            "speed": 1.0
+            "audioPath": narration_path,
+            "voice": DEFAULT_SCENE_CONFIG["voiceId"],
+            "speed": DEFAULT_SCENE_CONFIG["voiceSpeed"]
         },
         "scenes": [],
-        "output": {
-            "filmSlug": film_slug,
-            "baseDir": base_dir,
-            "imagesDir": dirs['images'],
-            "videosDir": dirs['videos'],
-            "audioDir": dirs['audio'],
-            "finalVideo": get_final_video_path(dirs, film_slug)
-        }
+        "output": dict(output)
     }
 
 if __name__ == "__main__":
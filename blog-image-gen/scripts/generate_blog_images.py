@@ -17,9 +17,17 @@ import os
 import sys
 import re
 import argparse
+import functools
+import hashlib
+import json
+import mmap
+import random
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Iterable, Iterator, Optional, List, Tuple
 
 # Try new google-genai SDK first (recommended)
 GENAI_SDK = None
@@ -44,13 +52,10 @@ if GENAI_SDK is None:
     print("  pip install google-genai")
     sys.exit(1)
 
-try:
-    from PIL import Image
-    from io import BytesIO
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
-    print("Warning: PIL not available. Install with: pip install pillow")
+# Pillow is imported on first use by get_pil_image(), since most saves don't
+# need it; PIL_AVAILABLE stays None until then
+PIL_AVAILABLE: Optional[bool] = None
+_PIL_IMAGE = None
 
 
 # Model configurations
@@ -68,8 +73,69 @@ MODELS = {
 
 DEFAULT_MODEL = "imagen-4"
 
+# API family of each known model ID, so resolve_model only inspects the
+# name of models it doesn't know
+_MODEL_TYPE = {
+    model_id: ("gemini" if "gemini" in model_id else "imagen")
+    for model_id in MODELS.values()
+}
+
 # Valid aspect ratios
-VALID_ASPECT_RATIOS = ["1:1", "3:4", "4:3", "9:16", "16:9"]
+VALID_ASPECT_RATIOS = ("1:1", "3:4", "4:3", "9:16", "16:9")
+
+# Valid image sizes
+VALID_SIZES = ("1K", "2K")
+
+# Output file extensions and the image format they hold
+IMAGE_FORMATS_BY_SUFFIX = {
+    ".png": "png",
+    ".jpg": "jpeg",
+    ".jpeg": "jpeg",
+    ".webp": "webp",
+    ".gif": "gif",
+}
+
+# Per-request timeout for the Gemini client (milliseconds)
+REQUEST_TIMEOUT_MS = 120_000
+
+# Parsed prompts files are cached by content hash; bump the version when
+# the parser changes so stale results are not reused
+PROMPTS_CACHE_DIR = Path.home() / ".cache" / "augmi-skills" / "prompts"
+PROMPTS_CACHE_MAX_ENTRIES = 64
+PROMPTS_PARSER_VERSION = 3
+
+# Regexes for prompt headers and slugify, compiled on first use so
+# single-prompt runs never pay for them
+_PROMPT_HEADER_RE: Optional["re.Pattern"] = None
+_SLUG_STRIP_RE: Optional["re.Pattern"] = None
+_SLUG_DASH_RE: Optional["re.Pattern"] = None
+
+# ASCII slug characters: letters and digits lowercased, underscores kept,
+# whitespace and hyphens turned into hyphens, everything else dropped
+_SLUG_TABLE = {
+    i: (chr(i).lower() if chr(i).isalnum() or chr(i) == '_'
+        else '-' if chr(i).isspace() or chr(i) == '-'
+        else None)
+    for i in range(128)
+}
+
+# Records finished prompts in prompts-file mode (see generate_from_prompts_file)
+MANIFEST_FILENAME = "manifest.json"
+
+# Shared client, see get_client()
+_CLIENT: Optional["genai.Client"] = None
+
+# Serializes output from worker threads, see log()
+_OUTPUT_LOCK = threading.Lock()
+
+# Prompts generated at the same time in prompts-file mode
+DEFAULT_CONCURRENCY = 4
+
+# Client-side rate limit: starting requests per minute, the floor it can be
+# cut to after rate-limit errors, and retries per prompt on those errors
+DEFAULT_RPM = 60
+MIN_RPM = 2
+DEFAULT_MAX_RETRIES = 5
 
 
 def get_api_key() -> str:
@@ -91,9 +157,110 @@ def create_client():
         )
 
     api_key = get_api_key()
-    return genai.Client(api_key=api_key)
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(timeout=REQUEST_TIMEOUT_MS)
+    )
+
+
+def get_client():
+    """
+    Get the shared Gemini client, creating it on first use.
+
+    The client keeps its HTTP connections alive, so every request after the
+    first skips the TCP/TLS handshake. Reuse it rather than creating a new
+    client per prompt.
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = create_client()
+    return _CLIENT
+
+
+def log(*lines: str) -> None:
+    """
+    Print lines as a single block.
+
+    Safe to call from worker threads: a message's lines are never
+    interleaved with another thread's output.
+    """
+    text = "\n".join(lines) + "\n"
+    with _OUTPUT_LOCK:
+        sys.stdout.write(text)
+
+
+class RateLimiter:
+    """
+    Client-side token bucket shared by all request threads.
+
+    Tokens refill at `rpm` requests per minute. Each rate-limit error halves
+    the rate and pauses requests for the server's Retry-After; each success
+    raises it again by one request per minute (up to the starting rate), so
+    a batch settles just under the API's actual limit instead of repeatedly
+    hitting 429s.
+    """
+
+    def __init__(self, rpm: float = DEFAULT_RPM, burst: int = 1):
+        self.max_rpm = rpm
+        self.rpm = rpm
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rpm / 60)
+        self.updated = now
+
+    def acquire(self) -> None:
+        """Block until a request may be sent"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) * 60 / self.rpm)
+            time.sleep(wait)
+
+    def on_success(self) -> None:
+        """Additively recover the rate after a successful request"""
+        with self.lock:
+            self.rpm = min(self.max_rpm, self.rpm + 1)
+
+    def penalize(self, retry_after: float) -> None:
+        """Halve the rate and pause all requests after a rate-limit error"""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rpm = max(MIN_RPM, self.rpm / 2)
+            self.tokens = 0.0
+            self.paused_until = max(self.paused_until, now + retry_after)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Check for a 429 / RESOURCE_EXHAUSTED error from either Google SDK"""
+    for attr in ('code', 'status_code'):
+        if getattr(error, attr, None) == 429:
+            return True
+    return 'RESOURCE_EXHAUSTED' in str(error)
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """Read the Retry-After header (in seconds) from a rate-limit error"""
+    retry_after = getattr(error, 'retry_after', None)
+    if retry_after is None:
+        headers = getattr(getattr(error, 'response', None), 'headers', None)
+        retry_after = headers.get('Retry-After') if headers else None
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):
+        return None
 
 
+@functools.lru_cache(maxsize=32)
 def resolve_model(model_name: str) -> Tuple[str, str]:
     """
     Resolve model shorthand to full model ID.
@@ -101,10 +268,11 @@ def resolve_model(model_name: str) -> Tuple[str, str]:
     Returns:
         Tuple of (model_type, model_id) where model_type is 'imagen' or 'gemini'
     """
-    if model_name in MODELS:
-        model_id = MODELS[model_name]
-    else:
-        model_id = model_name
+    model_id = MODELS.get(model_name, model_name)
+
+    model_type = _MODEL_TYPE.get(model_id)
+    if model_type is not None:
+        return (model_type, model_id)
 
     # Determine model type
     if "imagen" in model_id.lower():
@@ -138,8 +306,10 @@ def generate_image_imagen(
     Returns:
         List of image bytes
     """
-    print(f"  Using Imagen model: {model}")
-    print(f"  Aspect ratio: {aspect_ratio}, Size: {size}")
+    log(
+        f"  Using Imagen model: {model}",
+        f"  Aspect ratio: {aspect_ratio}, Size: {size}"
+    )
 
     response = client.models.generate_images(
         model=model,
@@ -159,6 +329,42 @@ def generate_image_imagen(
     return images
 
 
+def iter_image_parts(
+    client: genai.Client,
+    model: str,
+    prompt: str,
+    config: "types.GenerateContentConfig"
+) -> Iterator[bytes]:
+    """
+    Yield inline image data from a generate_content call as it arrives.
+
+    Streams the response when the SDK supports it, so each image can be
+    handled as soon as its part is received; otherwise falls back to a
+    regular request. The stream is closed when the generator is, so
+    callers that stop early should close it.
+    """
+    if hasattr(client.models, 'generate_content_stream'):
+        chunks = client.models.generate_content_stream(
+            model=model, contents=prompt, config=config
+        )
+    else:
+        chunks = [client.models.generate_content(
+            model=model, contents=prompt, config=config
+        )]
+
+    try:
+        for chunk in chunks:
+            if not chunk.candidates or not chunk.candidates[0].content:
+                continue
+            for part in chunk.candidates[0].content.parts or []:
+                if getattr(part, 'inline_data', None) and part.inline_data.data:
+                    yield part.inline_data.data
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
 def generate_image_gemini(
     client: genai.Client,
     prompt: str,
@@ -179,27 +385,20 @@ def generate_image_gemini(
     Returns:
         List of image bytes
     """
-    print(f"  Using Gemini model: {model}")
-    print(f"  Aspect ratio: {aspect_ratio}, Size: {size}")
+    log(
+        f"  Using Gemini model: {model}",
+        f"  Aspect ratio: {aspect_ratio}, Size: {size}"
+    )
 
-    response = client.models.generate_content(
-        model=model,
-        contents=prompt,
-        config=types.GenerateContentConfig(
-            response_modalities=['IMAGE'],
-            image_config=types.ImageConfig(
-                aspect_ratio=aspect_ratio,
-                image_size=size.upper()
-            )
+    config = types.GenerateContentConfig(
+        response_modalities=['IMAGE'],
+        image_config=types.ImageConfig(
+            aspect_ratio=aspect_ratio,
+            image_size=size.upper()
         )
     )
 
-    images = []
-    for part in response.parts:
-        if hasattr(part, 'inline_data') and part.inline_data:
-            images.append(part.inline_data.data)
-
-    return images
+    return list(iter_image_parts(client, model, prompt, config))
 
 
 def generate_image(
@@ -236,26 +435,111 @@ def generate_image(
         )
 
 
+def generate_image_rate_limited(
+    client: genai.Client,
+    rate_limiter: RateLimiter,
+    prompt: str,
+    model_name: str = DEFAULT_MODEL,
+    aspect_ratio: str = "16:9",
+    size: str = "1K",
+    count: int = 1,
+    max_retries: int = DEFAULT_MAX_RETRIES
+) -> List[bytes]:
+    """
+    Generate image(s) through the rate limiter, retrying rate-limit errors.
+
+    Waits for Retry-After when the API sends it, otherwise backs off
+    exponentially with jitter. Other errors are raised immediately.
+    """
+    for attempt in range(max_retries + 1):
+        rate_limiter.acquire()
+        try:
+            images = generate_image(client, prompt, model_name, aspect_ratio, size, count)
+        except Exception as e:
+            if attempt == max_retries or not is_rate_limit_error(e):
+                raise
+            wait = get_retry_after(e)
+            if wait is None:
+                wait = 2 ** attempt + random.uniform(0, 1)
+            log(f"  Rate limited, retrying in {wait:.1f}s (attempt {attempt + 2}/{max_retries + 1})...")
+            rate_limiter.penalize(wait)
+            continue
+
+        rate_limiter.on_success()
+        return images
+
+
+def detect_image_format(image_bytes: bytes) -> Optional[str]:
+    """Identify PNG, JPEG, WebP and GIF data from its leading bytes"""
+    if image_bytes[:8] == b'\x89PNG\r\n\x1a\n':
+        return 'png'
+    if image_bytes[:3] == b'\xff\xd8\xff':
+        return 'jpeg'
+    if image_bytes[:4] == b'RIFF' and image_bytes[8:12] == b'WEBP':
+        return 'webp'
+    if image_bytes[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    return None
+
+
+def get_pil_image():
+    """Import and return PIL.Image, or None if Pillow is not installed"""
+    global PIL_AVAILABLE, _PIL_IMAGE
+    if PIL_AVAILABLE is None:
+        try:
+            from PIL import Image
+            _PIL_IMAGE = Image
+            PIL_AVAILABLE = True
+        except ImportError:
+            PIL_AVAILABLE = False
+            log("Warning: PIL not available. Install with: pip install pillow")
+    return _PIL_IMAGE
+
+
 def save_image(image_bytes: bytes, output_path: str) -> str:
-    """Save image bytes to file"""
+    """
+    Save image bytes to file.
+
+    The API returns encoded images, so when the data already matches the
+    output extension it is written as-is; PIL is only used to convert to
+    a different format. The file is replaced atomically.
+    """
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    if PIL_AVAILABLE:
-        # Use PIL to ensure proper format
+    source_format = detect_image_format(image_bytes)
+    target_format = IMAGE_FORMATS_BY_SUFFIX.get(output_path.suffix.lower())
+
+    # Write to a temporary file and rename it into place, so an interrupted
+    # save never leaves a truncated image behind
+    tmp_path = output_path.with_suffix(output_path.suffix + '.tmp')
+
+    # Only skip PIL when both formats are known and already agree
+    if source_format is not None and source_format == target_format:
+        Image = None
+    else:
+        Image = get_pil_image()
+    if Image is not None:
+        # Convert to the format the extension asks for; other extensions
+        # (.bmp, .tiff, ...) are resolved by PIL, as a plain save would
+        pil_format = target_format or Image.registered_extensions().get(
+            output_path.suffix.lower()
+        )
+        if pil_format is None:
+            raise ValueError(f"unknown file extension: {output_path.suffix}")
         image = Image.open(BytesIO(image_bytes))
-        image.save(output_path)
+        image.save(tmp_path, format=pil_format)
     else:
         # Direct write
-        with open(output_path, 'wb') as f:
-            f.write(image_bytes)
+        tmp_path.write_bytes(image_bytes)
 
+    os.replace(tmp_path, output_path)
     return str(output_path)
 
 
-def parse_prompts_file(file_path: str) -> List[Tuple[str, str, str]]:
+def iter_prompts(lines: Iterable[str]) -> Iterator[Tuple[str, str, str]]:
     """
-    Parse a markdown file containing image prompts.
+    Parse image prompts from markdown lines in a single pass.
 
     Expected format:
     ## Prompt N: Title
@@ -266,35 +550,150 @@ def parse_prompts_file(file_path: str) -> List[Tuple[str, str, str]]:
     The actual prompt text here
     ```
 
+    A header is followed by its first fenced block; a header with no block
+    before the next header is skipped.
+
+    Yields:
+        Tuples of (prompt_id, title, prompt_text)
+    """
+    global _PROMPT_HEADER_RE
+    if _PROMPT_HEADER_RE is None:
+        _PROMPT_HEADER_RE = re.compile(r'##\s*Prompt\s*(\d+)[:\s]*(.*)', re.IGNORECASE)
+
+    header = None
+    body = None
+
+    for line in lines:
+        if body is not None:
+            # Inside the prompt's fence
+            end = line.find('```')
+            if end < 0:
+                body.append(line)
+                continue
+            body.append(line[:end])
+            prompt_text = "\n".join(body).strip()
+            if prompt_text:
+                yield (*header, prompt_text)
+            header = body = None
+            continue
+
+        match = _PROMPT_HEADER_RE.search(line)
+        if match:
+            header = (match.group(1), match.group(2).strip())
+            continue
+
+        if header is not None and line.lstrip().startswith('```'):
+            # Opening fence; anything after it (e.g. a language tag) is skipped,
+            # unless the whole prompt sits on this line
+            rest = line.lstrip()[3:]
+            if '```' in rest:
+                prompt_text = rest[:rest.index('```')].strip()
+                if prompt_text:
+                    yield (*header, prompt_text)
+                header = None
+            else:
+                body = []
+
+
+def parse_prompts(content: str) -> List[Tuple[str, str, str]]:
+    """
+    Parse image prompts from markdown text (see iter_prompts).
+
     Returns:
         List of tuples: (prompt_id, title, prompt_text)
     """
-    with open(file_path, 'r') as f:
-        content = f.read()
+    return list(iter_prompts(content.splitlines()))
 
-    prompts = []
 
-    # Find all prompt sections
-    # Pattern matches: ## Prompt N: Title ... ``` prompt text ```
-    pattern = r'##\s*Prompt\s*(\d+)[:\s]*([^\n]*)\n.*?```\n?(.*?)```'
-    matches = re.findall(pattern, content, re.DOTALL | re.IGNORECASE)
+def prune_prompts_cache() -> None:
+    """Keep only the most recently used PROMPTS_CACHE_MAX_ENTRIES entries"""
+    entries = sorted(
+        PROMPTS_CACHE_DIR.glob("*.json"),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True
+    )
+    for path in entries[PROMPTS_CACHE_MAX_ENTRIES:]:
+        path.unlink(missing_ok=True)
 
-    for match in matches:
-        prompt_num = match[0].strip()
-        title = match[1].strip()
-        prompt_text = match[2].strip()
 
-        if prompt_text:
-            prompts.append((prompt_num, title, prompt_text))
+def parse_prompts_file(file_path: str) -> List[Tuple[str, str, str]]:
+    """
+    Parse a markdown file containing image prompts (see parse_prompts).
+
+    Results are cached under ~/.cache/augmi-skills/prompts by a hash of the
+    file contents, so re-running on an unchanged file skips parsing. The file
+    is memory-mapped rather than read into a string: it is hashed in place
+    and decoded a line at a time while parsing.
+
+    Returns:
+        List of tuples: (prompt_id, title, prompt_text)
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            digest = hashlib.blake2b(data, digest_size=16)
+            digest.update(f"v{PROMPTS_PARSER_VERSION}".encode())
+            cache_path = PROMPTS_CACHE_DIR / f"{digest.hexdigest()}.json"
+
+            try:
+                with open(cache_path, 'r') as cache_file:
+                    prompts = [tuple(prompt) for prompt in json.load(cache_file)]
+                os.utime(cache_path)  # Mark as recently used
+                return prompts
+            except (OSError, ValueError):
+                pass
+
+            prompts = list(iter_prompts(
+                line.decode('utf-8').rstrip('\r\n')
+                for line in iter(data.readline, b'')
+            ))
+
+    try:
+        PROMPTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(prompts))
+        os.replace(tmp_path, cache_path)
+        prune_prompts_cache()
+    except OSError:
+        # Caching is best effort (e.g. read-only home directory)
+        pass
 
     return prompts
 
 
+def load_manifest(manifest_path: Path) -> dict:
+    """Load a prompts-file manifest, or an empty one if missing or unreadable"""
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(manifest_path: Path, manifest: dict) -> None:
+    """Write a prompts-file manifest atomically"""
+    tmp_path = manifest_path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
 def slugify(text: str) -> str:
     """Convert text to a valid filename slug"""
-    # Remove special characters, convert to lowercase, replace spaces with hyphens
-    slug = re.sub(r'[^\w\s-]', '', text.lower())
-    slug = re.sub(r'[-\s]+', '-', slug).strip('-')
+    global _SLUG_STRIP_RE, _SLUG_DASH_RE
+    if _SLUG_STRIP_RE is None:
+        _SLUG_STRIP_RE = re.compile(r'[^\w\s-]')
+        _SLUG_DASH_RE = re.compile(r'[-\s]+')
+
+    if text.isascii():
+        # Single translate pass, then collapse the hyphen runs it leaves
+        slug = text.translate(_SLUG_TABLE)
+    else:
+        # Remove special characters, convert to lowercase
+        slug = _SLUG_STRIP_RE.sub('', text.lower())
+    slug = _SLUG_DASH_RE.sub('-', slug).strip('-')
     return slug[:50]  # Limit length
 
 
@@ -305,11 +704,24 @@ def generate_from_prompts_file(
     model_name: str = DEFAULT_MODEL,
     aspect_ratio: str = "16:9",
     size: str = "1K",
-    delay: float = 0
+    delay: float = 0,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rpm: float = DEFAULT_RPM,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    count: int = 1,
+    force: bool = False
 ) -> List[str]:
     """
     Generate images from all prompts in a markdown file.
 
+    Prompts are independent, so up to `concurrency` requests run at once,
+    paced by a shared RateLimiter so rate-limited prompts are retried
+    rather than lost. Images are saved on a separate thread, so a request
+    worker moves on to its next prompt while the previous image is written.
+    Prompts already recorded in the output directory's manifest.json, with
+    their images still present, are skipped unless `force` is set, so an
+    interrupted batch can be resumed.
+
     Args:
         client: Gemini client
         prompts_file: Path to markdown file with prompts
@@ -317,10 +729,15 @@ def generate_from_prompts_file(
         model_name: Model to use
         aspect_ratio: Image aspect ratio
         size: Image size
-        delay: Delay between requests in seconds
+        delay: Minimum delay between starting requests in seconds
+        concurrency: Number of requests running at the same time
+        rpm: Starting client-side limit in requests per minute
+        max_retries: Retries per prompt after rate-limit errors
+        count: Variants per prompt (1-4, Imagen only), all from one request
+        force: Regenerate prompts that were already generated
 
     Returns:
-        List of generated image paths
+        List of generated image paths, in prompt order
     """
     prompts = parse_prompts_file(prompts_file)
 
@@ -331,49 +748,127 @@ def generate_from_prompts_file(
 
     print(f"\nFound {len(prompts)} prompts in {prompts_file}")
     print(f"Output directory: {output_dir}")
+    print(f"Concurrency: {concurrency}")
     print("-" * 50)
 
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    generated_files = []
-
+    # Gemini image models return one image per request
+    if resolve_model(model_name)[0] != "imagen":
+        count = 1
+
+    def image_paths(prompt_num: str, title: str) -> List[Path]:
+        # Create filenames from prompt number and title
+        if title:
+            base_name = f"{prompt_num}-{slugify(title)}"
+        else:
+            base_name = f"prompt-{prompt_num}"
+
+        if count > 1:
+            # Multiple variants: add suffix
+            return [output_path / f"{base_name}-{n}.png" for n in range(1, count + 1)]
+        return [output_path / f"{base_name}.png"]
+
+    # manifest.json records which files each finished prompt produced, keyed
+    # by everything that affects the images, so re-runs skip them
+    manifest_path = output_path / MANIFEST_FILENAME
+    manifest = load_manifest(manifest_path)
+    model_id = resolve_model(model_name)[1]
+
+    results: List[List[str]] = [[] for _ in prompts]
+    pending = []
     for i, (prompt_num, title, prompt_text) in enumerate(prompts):
-        print(f"\n[{i+1}/{len(prompts)}] Generating: {title or f'Prompt {prompt_num}'}")
-        print(f"  Prompt: {prompt_text[:80]}...")
+        key = hashlib.blake2b(
+            f"{prompt_text}\n{model_id}\n{aspect_ratio}\n{size}\n{count}".encode('utf-8'),
+            digest_size=12
+        ).hexdigest()
+        files = (manifest.get(key) or {}).get("files")
+        if not force and files and all(
+            (output_path / name).is_file() and (output_path / name).stat().st_size > 0
+            for name in files
+        ):
+            results[i] = [str(output_path / name) for name in files]
+        else:
+            pending.append((i, key, prompt_num, title, prompt_text))
+
+    skipped = len(prompts) - len(pending)
+    if skipped:
+        print(f"Skipping {skipped} prompts already generated (use --force to regenerate)")
+
+    start_time = time.monotonic()
+    rate_limiter = RateLimiter(rpm, burst=concurrency)
+
+    def save_all(label: str, key: str, images: List[bytes], paths: List[Path]) -> List[str]:
+        # Runs on the single save thread, so manifest updates never race
+        saved = []
+        try:
+            for image_bytes, path in zip(images, paths):
+                saved.append(save_image(image_bytes, str(path)))
+                log(f"  {label} Saved: {saved[-1]}")
+        except Exception as e:
+            log(f"  {label} Error: {e}")
+            return saved
+
+        manifest[key] = {
+            "files": [path.name for path in paths[:len(saved)]],
+            "model": model_id,
+            "aspect_ratio": aspect_ratio,
+            "size": size,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        write_manifest(manifest_path, manifest)
+        return saved
+
+    def generate_one(
+        n: int, key: str, prompt_num: str, title: str, prompt_text: str
+    ) -> Optional[Future]:
+        # Space request starts `delay` seconds apart to avoid rate limits
+        if delay > 0:
+            time.sleep(max(0, start_time + n * delay - time.monotonic()))
+
+        label = f"[{n+1}/{len(pending)}]"
+        log(
+            f"\n{label} Generating: {title or f'Prompt {prompt_num}'}",
+            f"  Prompt: {prompt_text[:80]}..."
+        )
 
         try:
-            images = generate_image(
+            images = generate_image_rate_limited(
                 client,
+                rate_limiter,
                 prompt_text,
                 model_name,
                 aspect_ratio,
                 size,
-                count=1
+                count=count,
+                max_retries=max_retries
             )
 
-            if images:
-                # Create filename from prompt number and title
-                if title:
-                    filename = f"{prompt_num}-{slugify(title)}.png"
-                else:
-                    filename = f"prompt-{prompt_num}.png"
-
-                file_path = output_path / filename
-                saved_path = save_image(images[0], str(file_path))
-                generated_files.append(saved_path)
-                print(f"  Saved: {saved_path}")
-            else:
-                print(f"  Warning: No image generated")
+            if not images:
+                log(f"  {label} Warning: No image generated")
+                return None
+
+            return save_executor.submit(
+                save_all, label, key, images, image_paths(prompt_num, title)
+            )
 
         except Exception as e:
-            print(f"  Error: {e}")
+            log(f"  {label} Error: {e}")
+            return None
 
-        # Delay between requests to avoid rate limits
-        if delay > 0 and i < len(prompts) - 1:
-            time.sleep(delay)
+    with ThreadPoolExecutor(max_workers=1) as save_executor, \
+            ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            (i, executor.submit(generate_one, n, key, prompt_num, title, prompt_text))
+            for n, (i, key, prompt_num, title, prompt_text) in enumerate(pending)
+        ]
+        save_futures = [(i, future.result()) for i, future in futures]
+        for i, save_future in save_futures:
+            if save_future:
+                results[i] = save_future.result()
 
-    return generated_files
+    return [path for paths in results for path in paths]
 
 
 def main():
@@ -408,7 +903,7 @@ def main():
     parser.add_argument(
         '--model', '-m',
         default=DEFAULT_MODEL,
-        choices=list(MODELS.keys()),
+        choices=tuple(MODELS),
         help=f'Model to use (default: {DEFAULT_MODEL})'
     )
     parser.add_argument(
@@ -420,31 +915,61 @@ def main():
     parser.add_argument(
         '--size', '-s',
         default='1K',
-        choices=['1K', '2K'],
+        choices=VALID_SIZES,
         help='Image size (default: 1K)'
     )
     parser.add_argument(
-        '--count', '-c',
+        '--count', '-c', '--variants-per-prompt',
+        dest='count',
         type=int,
         default=1,
         help='Number of images per prompt (1-4, Imagen only)'
     )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Regenerate prompts already recorded in the output manifest (prompts file)'
+    )
     parser.add_argument(
         '--delay',
         type=float,
         default=0,
         help='Delay between requests in seconds (for rate limiting)'
     )
+    parser.add_argument(
+        '--rpm',
+        type=float,
+        default=DEFAULT_RPM,
+        help=f'Client-side request limit per minute, lowered automatically on 429s (default: {DEFAULT_RPM})'
+    )
+    parser.add_argument(
+        '--max-retries',
+        type=int,
+        default=DEFAULT_MAX_RETRIES,
+        help=f'Retries per prompt after rate-limit errors (default: {DEFAULT_MAX_RETRIES})'
+    )
+    parser.add_argument(
+        '--concurrency', '-j',
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f'Prompts generated at the same time in prompts-file mode (default: {DEFAULT_CONCURRENCY})'
+    )
 
     args = parser.parse_args()
 
     # Validate
     if args.count < 1 or args.count > 4:
         parser.error("Count must be between 1 and 4")
+    if args.concurrency < 1:
+        parser.error("Concurrency must be at least 1")
+    if args.rpm <= 0:
+        parser.error("RPM must be positive")
+    if args.max_retries < 0:
+        parser.error("Max retries cannot be negative")
 
     # Create client
     try:
-        client = create_client()
+        client = get_client()
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
@@ -459,13 +984,15 @@ def main():
         print(f"Prompt: {args.prompt[:100]}...")
 
         try:
-            images = generate_image(
+            images = generate_image_rate_limited(
                 client,
+                RateLimiter(args.rpm),
                 args.prompt,
                 args.model,
                 args.aspect_ratio,
                 args.size,
-                args.count
+                args.count,
+                max_retries=args.max_retries
             )
 
             if images:
@@ -496,7 +1023,12 @@ def main():
             args.model,
             args.aspect_ratio,
             args.size,
-            args.delay
+            args.delay,
+            args.concurrency,
+            args.rpm,
+            args.max_retries,
+            args.count,
+            args.force
         )
 
         print("\n" + "=" * 50)
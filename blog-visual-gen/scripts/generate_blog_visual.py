@@ -15,6 +15,9 @@ Usage:
     # From text
     python generate_blog_visual.py --text "Your blog content..." --output visual.png
 
+    # Several posts at once, one visual per post
+    python generate_blog_visual.py --file posts/*.md --output-dir ./visuals
+
 Requirements:
     pip install google-genai pillow
 
@@ -25,8 +28,15 @@ Environment:
 import os
 import sys
 import argparse
+import hashlib
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from io import BytesIO
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, List, Optional
 
 try:
     from google import genai
@@ -36,12 +46,10 @@ except ImportError:
     print("Install with: pip install google-genai")
     sys.exit(1)
 
-try:
-    from PIL import Image
-    from io import BytesIO
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
+# Pillow is imported on first use by get_pil_image(), since most saves don't
+# need it; PIL_AVAILABLE stays None until then
+PIL_AVAILABLE: Optional[bool] = None
+_PIL_IMAGE = None
 
 
 # Model configurations
@@ -49,7 +57,43 @@ NANO_BANANA_MODEL = "nano-banana-pro-preview"
 GEMINI_TEXT_MODEL = "gemini-2.5-flash"
 
 # Valid aspect ratios
-VALID_ASPECT_RATIOS = ["1:1", "3:4", "4:3", "9:16", "16:9"]
+VALID_ASPECT_RATIOS = ("1:1", "3:4", "4:3", "9:16", "16:9")
+
+# Output file extensions and the image format they hold
+IMAGE_FORMATS_BY_SUFFIX = {
+    ".png": "png",
+    ".jpg": "jpeg",
+    ".jpeg": "jpeg",
+    ".webp": "webp",
+    ".gif": "gif",
+}
+
+# Per-request timeout for the Gemini client (milliseconds)
+REQUEST_TIMEOUT_MS = 120_000
+
+# Most characters read from a blog post file; far more than the analysis
+# uses, but keeps memory bounded for accidentally huge inputs
+MAX_BLOG_CHARS = 256 * 1024
+
+# Character budget for the blog content sent to the analysis model, and the
+# patterns used to pick what goes into it (see select_salient)
+ANALYSIS_MAX_CHARS = 6000
+_CODE_FENCE_RE = re.compile(r'```.*?```', re.S)
+_PARAGRAPH_BREAK_RE = re.compile(r'\n\s*\n')
+
+# Image prompts from deterministic (temperature 0) analyses, keyed by a hash
+# of the full analysis request, and how many to keep
+ANALYSIS_CACHE_DIR = Path.home() / ".cache" / "augmi-skills" / "blog-visual-analysis"
+ANALYSIS_CACHE_MAX_ENTRIES = 64
+
+# Posts processed at the same time when several files are given
+DEFAULT_CONCURRENCY = 4
+
+# Serializes output from worker threads, see log()
+_OUTPUT_LOCK = threading.Lock()
+
+# Shared client, see get_client()
+_CLIENT: Optional["genai.Client"] = None
 
 # Default style hints for different content types
 STYLE_HINTS = {
@@ -61,6 +105,29 @@ STYLE_HINTS = {
     "default": "modern digital art, professional quality, visually striking, balanced composition"
 }
 
+# Keywords that suggest each content type, matched in a single pass over the
+# content by one case-insensitive alternation with a named group per type
+CONTENT_TYPE_KEYWORDS = {
+    "tech": ['code', 'software', 'api', 'developer', 'programming', 'blockchain', 'crypto', 'ai', 'technology'],
+    "philosophy": ['wisdom', 'philosophy', 'meaning', 'consciousness', 'existence', 'thought', 'mind'],
+    "business": ['market', 'business', 'startup', 'investment', 'revenue', 'growth', 'strategy'],
+    "science": ['research', 'study', 'experiment', 'data', 'analysis', 'scientific', 'hypothesis'],
+}
+_CONTENT_TYPE_RE = re.compile(
+    r'\b(?:' + '|'.join(
+        f"(?P<{content_type}>{'|'.join(keywords)})"
+        for content_type, keywords in CONTENT_TYPE_KEYWORDS.items()
+    ) + ')',
+    re.IGNORECASE
+)
+
+
+def log(*lines: str) -> None:
+    """Print lines as one block, so concurrent posts don't interleave output"""
+    text = "\n".join(lines) + "\n"
+    with _OUTPUT_LOCK:
+        sys.stdout.write(text)
+
 
 def get_api_key() -> str:
     """Get Google AI API key from environment"""
@@ -76,17 +143,33 @@ def get_api_key() -> str:
 def create_client() -> genai.Client:
     """Create and return a configured Gemini client"""
     api_key = get_api_key()
-    return genai.Client(api_key=api_key)
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(timeout=REQUEST_TIMEOUT_MS)
+    )
+
+
+def get_client() -> genai.Client:
+    """
+    Get the shared Gemini client, creating it on first use.
+
+    The analysis and image requests share its keep-alive connection, so
+    only the first one pays the TCP/TLS handshake.
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = create_client()
+    return _CLIENT
 
 
 def read_blog_content(file_path: str) -> str:
-    """Read blog post content from a markdown file"""
+    """Read blog post content (up to MAX_BLOG_CHARS) from a markdown file"""
     path = Path(file_path)
     if not path.exists():
         raise FileNotFoundError(f"Blog post file not found: {file_path}")
 
     with open(path, 'r', encoding='utf-8') as f:
-        content = f.read()
+        content = f.read(MAX_BLOG_CHARS)
 
     if len(content.strip()) < 100:
         raise ValueError("Blog content too short. Provide at least a few paragraphs.")
@@ -94,17 +177,72 @@ def read_blog_content(file_path: str) -> str:
     return content
 
 
+def select_salient(content: str, max_chars: int = ANALYSIS_MAX_CHARS) -> str:
+    """
+    Pick the parts of a blog post most useful for describing it visually.
+
+    Code blocks are dropped, then the first paragraph (usually the intro) is
+    kept along with the longest remaining paragraphs that fit in the budget,
+    in their original order.
+
+    Args:
+        content: Blog post markdown
+        max_chars: Maximum length of the result
+
+    Returns:
+        Condensed content, at most max_chars long
+    """
+    content = _CODE_FENCE_RE.sub('', content)
+    paragraphs = [p.strip() for p in _PARAGRAPH_BREAK_RE.split(content) if p.strip()]
+    if not paragraphs:
+        return ""
+
+    intro = paragraphs[0]
+    if len(intro) > max_chars:
+        # End on a full sentence where there is one
+        intro = intro[:max_chars]
+        head, sep, _ = intro.rpartition('. ')
+        return head + sep.rstrip() if head else intro
+
+    selected = {0}
+    remaining = max_chars - len(intro)
+    by_length = sorted(range(1, len(paragraphs)), key=lambda i: len(paragraphs[i]), reverse=True)
+    for i in by_length:
+        needed = len(paragraphs[i]) + 2  # Blank line separator
+        if needed <= remaining:
+            selected.add(i)
+            remaining -= needed
+
+    return "\n\n".join(paragraphs[i] for i in sorted(selected))
+
+
+def prune_analysis_cache() -> None:
+    """Keep only the most recently used ANALYSIS_CACHE_MAX_ENTRIES entries"""
+    entries = sorted(
+        ANALYSIS_CACHE_DIR.glob("*.txt"),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True
+    )
+    for path in entries[ANALYSIS_CACHE_MAX_ENTRIES:]:
+        path.unlink(missing_ok=True)
+
+
 def analyze_content_and_generate_prompt(
     client: genai.Client,
     content: str,
     style_hint: str = "modern digital art",
-    verbose: bool = False
+    verbose: bool = False,
+    deterministic: bool = False,
+    use_cache: bool = True
 ) -> str:
     """
     Analyze blog content and generate an optimized image prompt.
 
     Uses Gemini to understand the content and create a visual description
     that captures the essence of the blog post.
+
+    Deterministic analyses (temperature 0) always give the same prompt for
+    the same content and style, so they are cached and reused.
     """
 
     analysis_prompt = f"""You are an expert at creating visual representations of written content.
@@ -122,32 +260,112 @@ Style direction: {style_hint}
 
 BLOG POST CONTENT:
 ---
-{content[:8000]}
+{select_salient(content)}
 ---
 
 Generate ONLY the image prompt, nothing else. No explanations, no preamble.
 Start directly with the visual description."""
 
-    response = client.models.generate_content(
-        model=GEMINI_TEXT_MODEL,
-        contents=analysis_prompt,
-        config=types.GenerateContentConfig(
-            temperature=0.7,
-            max_output_tokens=500
+    cache_path = None
+    if deterministic and use_cache:
+        key = hashlib.blake2b(
+            f"{GEMINI_TEXT_MODEL}\n{analysis_prompt}".encode('utf-8'), digest_size=16
+        ).hexdigest()
+        cache_path = ANALYSIS_CACHE_DIR / f"{key}.txt"
+
+    generated_prompt = None
+    if cache_path:
+        try:
+            generated_prompt = cache_path.read_text(encoding='utf-8')
+            os.utime(cache_path)  # Mark as recently used
+            if verbose:
+                log(f"   Reusing cached analysis: {cache_path}")
+        except OSError:
+            pass
+
+    if generated_prompt is None:
+        response = client.models.generate_content(
+            model=GEMINI_TEXT_MODEL,
+            contents=analysis_prompt,
+            config=types.GenerateContentConfig(
+                temperature=0.0 if deterministic else 0.7,
+                max_output_tokens=500
+            )
         )
-    )
 
-    generated_prompt = response.text.strip()
+        generated_prompt = response.text.strip()
+
+        if cache_path:
+            ANALYSIS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            # Per-thread temporary name: batch runs may analyze identical posts at once
+            tmp_path = cache_path.with_suffix(f'.{threading.get_ident()}.tmp')
+            tmp_path.write_text(generated_prompt, encoding='utf-8')
+            os.replace(tmp_path, cache_path)
+            prune_analysis_cache()
 
     if verbose:
-        print(f"\n📝 Generated Image Prompt:")
-        print("-" * 50)
-        print(generated_prompt)
-        print("-" * 50)
+        log(
+            f"\n📝 Generated Image Prompt:",
+            "-" * 50,
+            generated_prompt,
+            "-" * 50
+        )
 
     return generated_prompt
 
 
+def iter_image_parts(
+    client: genai.Client,
+    model: str,
+    prompt: str,
+    config: "types.GenerateContentConfig"
+) -> Iterator[bytes]:
+    """
+    Yield inline image data from a generate_content call as it arrives.
+
+    Streams the response when the SDK supports it, so each image can be
+    handled as soon as its part is received; otherwise falls back to a
+    regular request. The stream is closed when the generator is, so
+    callers that stop early should close it (see first_image_part).
+    """
+    if hasattr(client.models, 'generate_content_stream'):
+        chunks = client.models.generate_content_stream(
+            model=model, contents=prompt, config=config
+        )
+    else:
+        chunks = [client.models.generate_content(
+            model=model, contents=prompt, config=config
+        )]
+
+    try:
+        for chunk in chunks:
+            if not chunk.candidates or not chunk.candidates[0].content:
+                continue
+            for part in chunk.candidates[0].content.parts or []:
+                if getattr(part, 'inline_data', None) and part.inline_data.data:
+                    yield part.inline_data.data
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+def first_image_part(
+    client: genai.Client,
+    model: str,
+    prompt: str,
+    config: "types.GenerateContentConfig"
+) -> Optional[bytes]:
+    """
+    Return the first inline image of a generate_content call, or None.
+
+    The response stream is closed as soon as the image arrives, rather than
+    left open until garbage collection.
+    """
+    with closing(iter_image_parts(client, model, prompt, config)) as parts:
+        return next(parts, None)
+
+
 def generate_image_nano_banana(
     client: genai.Client,
     prompt: str,
@@ -167,65 +385,102 @@ def generate_image_nano_banana(
         Image bytes
     """
     if verbose:
-        print(f"\n🎨 Generating image with Nano Banana 3...")
-        print(f"   Model: {NANO_BANANA_MODEL}")
-        print(f"   Aspect ratio: {aspect_ratio}")
+        log(
+            f"\n🎨 Generating image with Nano Banana 3...",
+            f"   Model: {NANO_BANANA_MODEL}",
+            f"   Aspect ratio: {aspect_ratio}"
+        )
 
     # Nano Banana uses generate_content with IMAGE modality
-    response = client.models.generate_content(
-        model=NANO_BANANA_MODEL,
-        contents=prompt,
-        config=types.GenerateContentConfig(
-            response_modalities=['IMAGE'],
-            image_config=types.ImageConfig(
-                aspect_ratio=aspect_ratio
-            )
+    config = types.GenerateContentConfig(
+        response_modalities=['IMAGE'],
+        image_config=types.ImageConfig(
+            aspect_ratio=aspect_ratio
         )
     )
 
-    # Extract image from response
-    for part in response.candidates[0].content.parts:
-        if hasattr(part, 'inline_data') and part.inline_data:
-            return part.inline_data.data
-
-    raise RuntimeError("No image generated in response")
+    # Return the first image as soon as it arrives
+    image_bytes = first_image_part(client, NANO_BANANA_MODEL, prompt, config)
+    if image_bytes is None:
+        raise RuntimeError("No image generated in response")
+    return image_bytes
+
+
+def detect_image_format(image_bytes: bytes) -> Optional[str]:
+    """Identify PNG, JPEG, WebP and GIF data from its leading bytes"""
+    if image_bytes[:8] == b'\x89PNG\r\n\x1a\n':
+        return 'png'
+    if image_bytes[:3] == b'\xff\xd8\xff':
+        return 'jpeg'
+    if image_bytes[:4] == b'RIFF' and image_bytes[8:12] == b'WEBP':
+        return 'webp'
+    if image_bytes[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    return None
+
+
+def get_pil_image():
+    """Import and return PIL.Image, or None if Pillow is not installed"""
+    global PIL_AVAILABLE, _PIL_IMAGE
+    if PIL_AVAILABLE is None:
+        try:
+            from PIL import Image
+            _PIL_IMAGE = Image
+            PIL_AVAILABLE = True
+        except ImportError:
+            PIL_AVAILABLE = False
+    return _PIL_IMAGE
 
 
 def save_image(image_bytes: bytes, output_path: str) -> str:
-    """Save image bytes to file"""
+    """
+    Save image bytes to file.
+
+    The API returns encoded images, so when the data already matches the
+    output extension it is written as-is; PIL is only used to convert to
+    a different format.
+    """
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    if PIL_AVAILABLE:
+    source_format = detect_image_format(image_bytes)
+    target_format = IMAGE_FORMATS_BY_SUFFIX.get(output_path.suffix.lower())
+
+    # Write to a temporary file and rename it into place, so an interrupted
+    # save never leaves a truncated image behind
+    tmp_path = output_path.with_suffix(output_path.suffix + '.tmp')
+
+    # Only skip PIL when both formats are known and already agree
+    if source_format is not None and source_format == target_format:
+        Image = None
+    else:
+        Image = get_pil_image()
+    if Image is not None:
+        # Convert to the format the extension asks for; other extensions
+        # (.bmp, .tiff, ...) are resolved by PIL, as a plain save would
+        pil_format = target_format or Image.registered_extensions().get(
+            output_path.suffix.lower()
+        )
+        if pil_format is None:
+            raise ValueError(f"unknown file extension: {output_path.suffix}")
         image = Image.open(BytesIO(image_bytes))
-        image.save(output_path)
+        image.save(tmp_path, format=pil_format)
     else:
-        with open(output_path, 'wb') as f:
-            f.write(image_bytes)
+        # Direct write
+        tmp_path.write_bytes(image_bytes)
 
+    os.replace(tmp_path, output_path)
     return str(output_path)
 
 
 def detect_content_type(content: str) -> str:
     """Detect the type of content to choose appropriate style"""
-    content_lower = content.lower()
-
-    tech_keywords = ['code', 'software', 'api', 'developer', 'programming', 'blockchain', 'crypto', 'ai', 'technology']
-    philosophy_keywords = ['wisdom', 'philosophy', 'meaning', 'consciousness', 'existence', 'thought', 'mind']
-    business_keywords = ['market', 'business', 'startup', 'investment', 'revenue', 'growth', 'strategy']
-    science_keywords = ['research', 'study', 'experiment', 'data', 'analysis', 'scientific', 'hypothesis']
-
-    tech_score = sum(1 for kw in tech_keywords if kw in content_lower)
-    philosophy_score = sum(1 for kw in philosophy_keywords if kw in content_lower)
-    business_score = sum(1 for kw in business_keywords if kw in content_lower)
-    science_score = sum(1 for kw in science_keywords if kw in content_lower)
+    # Distinct keywords seen per type; a type needs three to be chosen
+    found = {content_type: set() for content_type in CONTENT_TYPE_KEYWORDS}
+    for match in _CONTENT_TYPE_RE.finditer(content):
+        found[match.lastgroup].add(match.group().lower())
 
-    scores = {
-        'tech': tech_score,
-        'philosophy': philosophy_score,
-        'business': business_score,
-        'science': science_score
-    }
+    scores = {content_type: len(keywords) for content_type, keywords in found.items()}
 
     best_type = max(scores, key=scores.get)
     if scores[best_type] >= 3:
@@ -239,7 +494,10 @@ def generate_blog_visual(
     output_path: str,
     aspect_ratio: str = "16:9",
     style: Optional[str] = None,
-    verbose: bool = False
+    verbose: bool = False,
+    deterministic: bool = False,
+    use_cache: bool = True,
+    label: str = ""
 ) -> str:
     """
     Main function to generate a visual from blog content.
@@ -251,37 +509,145 @@ def generate_blog_visual(
         aspect_ratio: Image aspect ratio
         style: Optional style override
         verbose: Print detailed output
+        deterministic: Analyze at temperature 0 (results are cached)
+        use_cache: Reuse cached deterministic analyses
+        label: Name shown with progress output (e.g. the post's file name)
 
     Returns:
         Path to saved image
     """
+    prefix = f"[{label}] " if label else ""
+
     # Detect content type if no style specified
     if style is None:
         content_type = detect_content_type(content)
         style = STYLE_HINTS.get(content_type, STYLE_HINTS['default'])
         if verbose:
-            print(f"📊 Detected content type: {content_type}")
-            print(f"   Using style: {style[:50]}...")
+            log(
+                f"📊 {prefix}Detected content type: {content_type}",
+                f"   Using style: {style[:50]}..."
+            )
 
     # Step 1: Analyze content and generate prompt
-    print("🔍 Analyzing blog content...")
+    log(f"🔍 {prefix}Analyzing blog content...")
     image_prompt = analyze_content_and_generate_prompt(
-        client, content, style, verbose
+        client, content, style, verbose, deterministic, use_cache
     )
 
     # Step 2: Generate image
-    print("🎨 Generating visual with Nano Banana 3...")
+    log(f"🎨 {prefix}Generating visual with Nano Banana 3...")
     image_bytes = generate_image_nano_banana(
         client, image_prompt, aspect_ratio, verbose
     )
 
     # Step 3: Save image
     saved_path = save_image(image_bytes, output_path)
-    print(f"✅ Visual saved: {saved_path}")
+    log(f"✅ {prefix}Visual saved: {saved_path}")
 
     return saved_path
 
 
+def batch_output_names(files: List[str]) -> List[str]:
+    """
+    Pick a distinct output file name for each post in a batch.
+
+    Posts are named after their file (blog-post.png). When several share a
+    file name, as with OUTPUT/<date>/*/blog-post.md, the parent directory
+    is prefixed (my-topic-blog-post.png), with a numeric suffix as a last
+    resort, so concurrent posts never write to the same file.
+
+    Raises:
+        ValueError: If the same post is given more than once
+    """
+    paths = []
+    seen = set()
+    for file_path in files:
+        path = Path(file_path).resolve()
+        if path in seen:
+            raise ValueError(f"Post given more than once: {file_path}")
+        seen.add(path)
+        paths.append(path)
+
+    stem_counts = Counter(path.stem for path in paths)
+    names = []
+    used = set()
+    for path in paths:
+        stem = path.stem if stem_counts[path.stem] == 1 else f"{path.parent.name}-{path.stem}"
+        name = f"{stem}.png"
+        suffix = 2
+        # Compared case-insensitively for case-insensitive filesystems
+        while name.lower() in used:
+            name = f"{stem}-{suffix}.png"
+            suffix += 1
+        used.add(name.lower())
+        names.append(name)
+
+    return names
+
+
+def generate_visuals_batch(
+    client: genai.Client,
+    files: List[str],
+    output_dir: str,
+    aspect_ratio: str = "16:9",
+    style: Optional[str] = None,
+    verbose: bool = False,
+    deterministic: bool = False,
+    use_cache: bool = True,
+    concurrency: int = DEFAULT_CONCURRENCY
+) -> List[str]:
+    """
+    Generate one visual per blog post file, several posts at a time.
+
+    Each post's analysis and image requests still run in order; posts are
+    independent, so up to `concurrency` of them are in flight at once.
+    Visuals are saved as <output_dir>/<post name>.png (see batch_output_names).
+
+    Args:
+        client: Gemini client
+        files: Paths to blog post markdown files
+        output_dir: Directory to save the visuals
+        aspect_ratio: Image aspect ratio
+        style: Optional style override (auto-detected per post otherwise)
+        verbose: Print detailed output
+        deterministic: Analyze at temperature 0 (results are cached)
+        use_cache: Reuse cached deterministic analyses
+        concurrency: Number of posts processed at the same time
+
+    Returns:
+        List of saved image paths, in input order (failed posts omitted)
+
+    Raises:
+        ValueError: If the same post is given more than once
+    """
+    output_path = Path(output_dir)
+    output_names = batch_output_names(files)
+
+    def generate_one(file_path: str, output_name: str) -> Optional[str]:
+        label = Path(file_path).name
+        try:
+            content = read_blog_content(file_path)
+            return generate_blog_visual(
+                client,
+                content,
+                str(output_path / output_name),
+                aspect_ratio,
+                style,
+                verbose,
+                deterministic,
+                use_cache,
+                label
+            )
+        except Exception as e:
+            log(f"❌ [{label}] Error: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(generate_one, files, output_names))
+
+    return [path for path in results if path]
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate graphic visuals from blog post content using Nano Banana 3"
@@ -291,7 +657,8 @@ def main():
     input_group = parser.add_mutually_exclusive_group(required=True)
     input_group.add_argument(
         '--file', '-f',
-        help='Path to blog post markdown file'
+        nargs='+',
+        help='Path to blog post markdown file (several files: one visual each, see --output-dir)'
     )
     input_group.add_argument(
         '--text', '-t',
@@ -304,6 +671,11 @@ def main():
         default='blog-visual.png',
         help='Output path for generated image (default: blog-visual.png)'
     )
+    parser.add_argument(
+        '--output-dir', '-d',
+        default='.',
+        help='Output directory when several files are given (default: current directory)'
+    )
 
     # Generation options
     parser.add_argument(
@@ -316,6 +688,22 @@ def main():
         '--style', '-s',
         help='Style hint for image generation (default: auto-detected)'
     )
+    parser.add_argument(
+        '--deterministic',
+        action='store_true',
+        help='Analyze content at temperature 0 so the same post gives the same prompt (cached)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Re-run the content analysis even if a cached result exists'
+    )
+    parser.add_argument(
+        '--concurrency', '-j',
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f'Posts processed at the same time when several files are given (default: {DEFAULT_CONCURRENCY})'
+    )
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -324,9 +712,12 @@ def main():
 
     args = parser.parse_args()
 
+    if args.concurrency < 1:
+        parser.error("Concurrency must be at least 1")
+
     # Create client
     try:
-        client = create_client()
+        client = get_client()
     except Exception as e:
         print(f"❌ Error: {e}")
         sys.exit(1)
@@ -335,11 +726,39 @@ def main():
     print("📷 Blog Visual Generator (Nano Banana 3)")
     print("=" * 50)
 
+    if args.file and len(args.file) > 1:
+        print(f"\n📄 Posts: {len(args.file)}, concurrency: {args.concurrency}\n")
+        try:
+            generated = generate_visuals_batch(
+                client,
+                args.file,
+                args.output_dir,
+                args.aspect_ratio,
+                args.style,
+                args.verbose,
+                args.deterministic,
+                not args.no_cache,
+                args.concurrency
+            )
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+
+        print("\n" + "=" * 50)
+        print("🎉 Generation complete!")
+        print(f"   Visuals generated: {len(generated)}/{len(args.file)}")
+        for path in generated:
+            print(f"   - {path}")
+
+        if len(generated) < len(args.file):
+            sys.exit(1)
+        return
+
     # Get content
     try:
         if args.file:
-            print(f"\n📄 Reading: {args.file}")
-            content = read_blog_content(args.file)
+            print(f"\n📄 Reading: {args.file[0]}")
+            content = read_blog_content(args.file[0])
         else:
             content = args.text
             if len(content) < 100:
@@ -356,7 +775,9 @@ def main():
             args.output,
             args.aspect_ratio,
             args.style,
-            args.verbose
+            args.verbose,
+            args.deterministic,
+            not args.no_cache
         )
 
         print("\n" + "=" * 50)
@@ -17,11 +17,13 @@ Usage:
 """
 
 import argparse
+import functools
 import math
 import os
 import re
 import sys
 import urllib.request
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 try:
@@ -74,6 +76,15 @@ GRADIENT_STRIP_HEIGHT = 5
 NUMBER_CIRCLE_SIZE = 64
 QUOTE_MARK_SIZE = 100
 
+# Output encoders by --output-format. Slides are flat graphics, so PNG's
+# higher zlib levels cost far more time than the space they save; JPEG at
+# quality 90 is visually indistinguishable on Instagram and much faster
+OUTPUT_FORMATS = {
+    "png": ("PNG", {"compress_level": 1}),
+    "jpg": ("JPEG", {"quality": 90}),
+}
+DEFAULT_OUTPUT_FORMAT = "png"
+
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 ASSETS_DIR = SCRIPT_DIR.parent / "assets"
@@ -122,16 +133,11 @@ def ensure_logo():
 
 def generate_augmi_logo(output_path: Path, size: int = 200):
     """Generate the Augmi isometric cube logo programmatically."""
-    img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    # Vertical cyan-to-emerald gradient: one column, stretched across
+    img = brand_gradient(size, vertical=True).convert("RGBA").resize((size, size), Image.NEAREST)
     draw = ImageDraw.Draw(img)
 
     corner_radius = size // 5
-    for y in range(size):
-        ratio = y / size
-        r = int(CYAN[0] + (EMERALD[0] - CYAN[0]) * ratio)
-        g = int(CYAN[1] + (EMERALD[1] - CYAN[1]) * ratio)
-        b = int(CYAN[2] + (EMERALD[2] - CYAN[2]) * ratio)
-        draw.line([(0, y), (size - 1, y)], fill=(r, g, b, 255))
 
     mask = Image.new("L", (size, size), 0)
     mask_draw = ImageDraw.Draw(mask)
@@ -160,8 +166,13 @@ def generate_augmi_logo(output_path: Path, size: int = 200):
     img.save(output_path, "PNG")
 
 
+@functools.lru_cache(maxsize=None)
 def load_font(bold: bool, size: int) -> ImageFont.FreeTypeFont:
-    """Load Inter font at given size, falling back to default if unavailable."""
+    """
+    Load Inter font at given size, falling back to default if unavailable.
+
+    Fonts are cached by (bold, size), so each face is parsed once per run.
+    """
     font_path = INTER_BOLD if bold else INTER_REGULAR
     try:
         return ImageFont.truetype(str(font_path), size)
@@ -170,23 +181,53 @@ def load_font(bold: bool, size: int) -> ImageFont.FreeTypeFont:
         return ImageFont.load_default()
 
 
+@functools.lru_cache(maxsize=4096)
+def text_bbox(text: str, font: ImageFont.FreeTypeFont) -> tuple[int, int, int, int]:
+    """
+    Get the bounding box of a text string, cached by (text, font).
+
+    The same strings (wrap candidates, counters, 'augmi.world') are measured
+    many times per carousel, and fonts are shared via load_font.
+    """
+    return font.getbbox(text)
+
+
 def wrap_text(text: str, font: ImageFont.FreeTypeFont, max_width: int) -> list[str]:
-    """Wrap text to fit within max_width pixels."""
-    words = text.split()
+    """
+    Wrap text to fit within max_width pixels.
+
+    Line widths are accumulated word by word from glyph advances; the exact
+    (kerned, ink-bounded) width of a candidate line is only measured when
+    the running estimate lands within a space's width of max_width, so
+    layout cost grows linearly with the number of words.
+    """
+    space_w = font.getlength(" ")
     lines = []
     current_line = []
+    current_w = 0.0
 
-    for word in words:
-        test_line = " ".join(current_line + [word])
-        bbox = font.getbbox(test_line)
-        line_width = bbox[2] - bbox[0]
-        if line_width <= max_width and current_line:
+    for word in text.split():
+        word_w = font.getlength(word)
+        if not current_line:
             current_line.append(word)
-        elif not current_line:
+            current_w = word_w
+            continue
+
+        candidate_w = current_w + space_w + word_w
+        if candidate_w <= max_width - space_w:
+            fits = True
+        elif candidate_w > max_width + space_w:
+            fits = False
+        else:
+            fits = text_width(" ".join(current_line + [word]), font) <= max_width
+
+        if fits:
             current_line.append(word)
+            current_w = candidate_w
         else:
             lines.append(" ".join(current_line))
             current_line = [word]
+            current_w = word_w
 
     if current_line:
         lines.append(" ".join(current_line))
@@ -196,27 +237,42 @@ def wrap_text(text: str, font: ImageFont.FreeTypeFont, max_width: int) -> list[s
 
 def text_height(text: str, font: ImageFont.FreeTypeFont) -> int:
     """Get the pixel height of a text string."""
-    bbox = font.getbbox(text)
+    bbox = text_bbox(text, font)
     return bbox[3] - bbox[1]
 
 
 def text_width(text: str, font: ImageFont.FreeTypeFont) -> int:
     """Get the pixel width of a text string."""
-    bbox = font.getbbox(text)
+    bbox = text_bbox(text, font)
     return bbox[2] - bbox[0]
 
 
 # --- Visual Elements ---
 
-def draw_gradient_strip(draw: ImageDraw.Draw, y: int, width: int):
+def brand_gradient(length: int, vertical: bool = False) -> Image.Image:
+    """
+    Build a one-pixel-wide cyan-to-emerald gradient of the given length.
+
+    Returned as a single RGB row (or column if vertical) so callers can
+    stretch it to any thickness with a cheap NEAREST resize.
+    """
+    pixels = bytearray()
+    for i in range(length):
+        ratio = i / length
+        pixels += bytes(int(start + (end - start) * ratio) for start, end in zip(CYAN, EMERALD))
+    size = (1, length) if vertical else (length, 1)
+    return Image.frombytes("RGB", size, bytes(pixels))
+
+
+@functools.lru_cache(maxsize=None)
+def gradient_strip(width: int) -> Image.Image:
+    """Render the top gradient strip once per width; it is the same on every slide."""
+    return brand_gradient(width).resize((width, GRADIENT_STRIP_HEIGHT), Image.NEAREST)
+
+
+def draw_gradient_strip(img: Image.Image, y: int, width: int):
     """Draw a thin cyan-to-emerald gradient strip across the slide."""
-    for x in range(width):
-        ratio = x / width
-        r = int(CYAN[0] + (EMERALD[0] - CYAN[0]) * ratio)
-        g = int(CYAN[1] + (EMERALD[1] - CYAN[1]) * ratio)
-        b = int(CYAN[2] + (EMERALD[2] - CYAN[2]) * ratio)
-        for dy in range(GRADIENT_STRIP_HEIGHT):
-            draw.point((x, y + dy), fill=(r, g, b))
+    img.paste(gradient_strip(width), (0, y))
 
 
 def draw_accent_line(draw: ImageDraw.Draw, x: int, y: int):
@@ -243,7 +299,26 @@ def draw_number_circle(draw: ImageDraw.Draw, x: int, y: int, number: int, font:
     draw.text((num_x, num_y), num_text, fill=BG_COLOR, font=font)
 
 
-def draw_swipe_cue(draw: ImageDraw.Draw, slide_width: int, slide_height: int):
+@functools.lru_cache(maxsize=64)
+def text_mask(text: str, font: ImageFont.FreeTypeFont) -> Image.Image:
+    """
+    Rasterise a fixed label (swipe cue, slide counter) once into a coverage mask.
+
+    The mask spans from the draw origin, so pasting a fill through it at
+    (x, y) gives the same pixels as draw.text((x, y), ...) on any background.
+    """
+    bbox = text_bbox(text, font)
+    mask = Image.new("L", (max(bbox[2], 1), max(bbox[3], 1)), 0)
+    ImageDraw.Draw(mask).text((0, 0), text, fill=255, font=font)
+    return mask
+
+
+def paste_text(img: Image.Image, xy: tuple[int, int], text: str, fill: tuple, font: ImageFont.FreeTypeFont):
+    """Draw a fixed label by pasting its cached mask in a solid fill."""
+    img.paste(fill, xy, text_mask(text, font))
+
+
+def draw_swipe_cue(img: Image.Image, slide_width: int, slide_height: int):
     """Draw a 'Swipe' text + arrow cue at the bottom center."""
     font = load_font(bold=False, size=SWIPE_TEXT_SIZE)
     swipe_text = "Swipe"
@@ -257,8 +332,8 @@ def draw_swipe_cue(draw: ImageDraw.Draw, slide_width: int, slide_height: int):
     x = (slide_width - total_w) // 2
     y = slide_height - LOGO_PADDING - SWIPE_TEXT_SIZE - 10
 
-    draw.text((x, y), swipe_text, fill=ZINC_500, font=font)
-    draw.text((x + sw + 12, y), arrow, fill=CYAN, font=font)
+    paste_text(img, (x, y), swipe_text, ZINC_500, font)
+    paste_text(img, (x + sw + 12, y), arrow, CYAN, font)
 
 
 def draw_logo_header(draw: ImageDraw.Draw, logo_img: Image.Image, y_offset: int = 0):
@@ -266,8 +341,7 @@ def draw_logo_header(draw: ImageDraw.Draw, logo_img: Image.Image, y_offset: int
     x = LOGO_PADDING
     y = LOGO_PADDING + y_offset
 
-    logo_resized = logo_img.copy()
-    logo_resized = logo_resized.resize((LOGO_ICON_SIZE, LOGO_ICON_SIZE), Image.LANCZOS)
+    logo_resized = logo_img.resize((LOGO_ICON_SIZE, LOGO_ICON_SIZE), Image.LANCZOS)
 
     font = load_font(bold=True, size=LOGO_TEXT_SIZE)
     text_x = x + LOGO_ICON_SIZE + LOGO_TEXT_GAP
@@ -278,21 +352,57 @@ def draw_logo_header(draw: ImageDraw.Draw, logo_img: Image.Image, y_offset: int
     return logo_resized, (x, y)
 
 
-def draw_slide_counter(draw: ImageDraw.Draw, slide_num: int, total_slides: int):
+def draw_slide_counter(img: Image.Image, slide_num: int, total_slides: int):
     """Draw slide counter in bottom-right."""
     counter_font = load_font(bold=False, size=COUNTER_SIZE)
     counter_text = f"{slide_num} / {total_slides}"
     cw = text_width(counter_text, counter_font)
     counter_x = SLIDE_WIDTH - LOGO_PADDING - cw
     counter_y = SLIDE_HEIGHT - LOGO_PADDING - COUNTER_SIZE
-    draw.text((counter_x, counter_y), counter_text, fill=ZINC_500, font=counter_font)
+    paste_text(img, (counter_x, counter_y), counter_text, ZINC_500, counter_font)
+
+
+@functools.lru_cache(maxsize=None)
+def load_logo(logo_path: str) -> Image.Image:
+    """
+    Decode the logo once per run (per worker process).
+
+    The result is shared, so callers must not modify it in place.
+    """
+    with Image.open(logo_path) as logo:
+        return logo.convert("RGBA")
+
+
+@functools.lru_cache(maxsize=None)
+def logo_icon(logo_path: str, size: int) -> Image.Image:
+    """Get the logo resized to a square icon, once per path and size."""
+    return load_logo(logo_path).resize((size, size), Image.LANCZOS)
+
+
+@functools.lru_cache(maxsize=None)
+def logo_header_tile(logo_path: str) -> Image.Image:
+    """
+    Prerender the logo header (icon + 'augmi.world') once per run.
+
+    The header always sits on the plain background in the top-left corner,
+    so it is rendered there on a background-filled canvas and cropped to a
+    tile that can be pasted onto any slide as-is.
+    """
+    font = load_font(bold=True, size=LOGO_TEXT_SIZE)
+    bbox = text_bbox("augmi.world", font)
+    text_y = LOGO_PADDING + (LOGO_ICON_SIZE - LOGO_TEXT_SIZE) // 2
+    right = LOGO_PADDING + LOGO_ICON_SIZE + LOGO_TEXT_GAP + bbox[2]
+    bottom = max(LOGO_PADDING + LOGO_ICON_SIZE, text_y + bbox[3])
+
+    canvas = Image.new("RGB", (right, bottom), BG_COLOR)
+    logo_resized, logo_pos = draw_logo_header(ImageDraw.Draw(canvas), load_logo(logo_path))
+    canvas.paste(logo_resized, logo_pos, logo_resized)
+    return canvas.crop((LOGO_PADDING, LOGO_PADDING, right, bottom))
 
 
 def paste_logo(img: Image.Image, draw: ImageDraw.Draw, logo_path: str):
-    """Load, draw, and paste the logo onto an RGBA image."""
-    logo_img = Image.open(logo_path).convert("RGBA")
-    logo_resized, logo_pos = draw_logo_header(draw, logo_img)
-    img.paste(logo_resized, logo_pos, logo_resized)
+    """Paste the prerendered logo header onto a slide."""
+    img.paste(logo_header_tile(logo_path), (LOGO_PADDING, LOGO_PADDING))
 
 
 # --- Content Area Helpers ---
@@ -329,6 +439,42 @@ def resize_and_crop(img: Image.Image, target_size: tuple[int, int]) -> Image.Ima
     return img
 
 
+@functools.lru_cache(maxsize=None)
+def bottom_gradient_overlay() -> Image.Image:
+    """
+    Build the overlay that blends bottom-half images into the dark background.
+
+    It is identical for every slide, so it is built once per run.
+    """
+    # Gradient overlay for smooth blending (dark at top -> transparent at bottom):
+    # a one-pixel alpha column stretched across the width
+    # 100% opacity at top (y=0) -> 15% opacity at bottom (y=675)
+    ramp = bytes(
+        int(255 * (1.0 - (y / BOTTOM_HALF_HEIGHT) * 0.85))  # 255 -> ~38
+        for y in range(BOTTOM_HALF_HEIGHT)
+    )
+    alpha = Image.frombytes("L", (1, BOTTOM_HALF_HEIGHT), ramp)
+    gradient = Image.new("RGBA", BOTTOM_IMAGE_SIZE, (*BG_COLOR, 0))
+    gradient.putalpha(alpha.resize(BOTTOM_IMAGE_SIZE, Image.NEAREST))
+    return gradient
+
+
+@functools.lru_cache(maxsize=16)
+def bottom_image_tile(blog_image_path: str) -> Image.Image:
+    """
+    Decode, crop and blend a blog image for the bottom half, once per image.
+
+    Blog images are cycled across slides, so the same image is often used
+    more than once in a carousel.
+    """
+    # Load and center-crop blog image to fill bottom half
+    with Image.open(blog_image_path) as blog_img:
+        blog_img = resize_and_crop(blog_img.convert("RGBA"), BOTTOM_IMAGE_SIZE)
+
+    # Apply gradient over blog image
+    return Image.alpha_composite(blog_img, bottom_gradient_overlay())
+
+
 def composite_bottom_image(base_img: Image.Image, blog_image_path: str) -> Image.Image:
     """
     Composite a blog image into the bottom half of a slide with gradient overlay.
@@ -338,35 +484,26 @@ def composite_bottom_image(base_img: Image.Image, blog_image_path: str) -> Image
     if not blog_image_path or not os.path.exists(blog_image_path):
         return base_img
 
-    # Ensure base is RGBA
-    if base_img.mode != "RGBA":
-        base_img = base_img.convert("RGBA")
-
-    # Load and center-crop blog image to fill bottom half
-    blog_img = Image.open(blog_image_path).convert("RGBA")
-    blog_img = resize_and_crop(blog_img, BOTTOM_IMAGE_SIZE)
-
-    # Create gradient overlay for smooth blending (dark at top -> transparent at bottom)
-    gradient = Image.new("RGBA", BOTTOM_IMAGE_SIZE, (0, 0, 0, 0))
-    gradient_draw = ImageDraw.Draw(gradient)
-    for y in range(BOTTOM_HALF_HEIGHT):
-        # 100% opacity at top (y=0) -> 15% opacity at bottom (y=675)
-        progress = y / BOTTOM_HALF_HEIGHT
-        alpha = int(255 * (1.0 - progress * 0.85))  # 255 -> ~38
-        gradient_draw.line(
-            [(0, y), (SLIDE_WIDTH, y)],
-            fill=(BG_COLOR[0], BG_COLOR[1], BG_COLOR[2], alpha),
-        )
+    blog_with_gradient = bottom_image_tile(blog_image_path)
 
-    # Apply gradient over blog image
-    blog_with_gradient = Image.alpha_composite(blog_img, gradient)
-
-    # Paste into bottom half of base image
+    # Paste into bottom half of base image; the tile's own alpha is the mask,
+    # so this blends correctly onto the RGB slide
     base_img.paste(blog_with_gradient, (0, TOP_HALF_HEIGHT), blog_with_gradient)
 
     return base_img
 
 
+def draw_text_runs(draw: ImageDraw.Draw, runs: list[tuple[tuple[int, int], str, tuple, ImageFont.FreeTypeFont]]):
+    """
+    Draw the text runs collected by a slide's layout pass, in order.
+
+    Slide creators first wrap, measure and position every line, appending
+    (xy, text, fill, font) runs, then rasterise them back to back here.
+    """
+    for xy, text, fill, font in runs:
+        draw.text(xy, text, fill=fill, font=font)
+
+
 def create_cover_slide(
     cover_image_path: str,
     title: str,
@@ -378,8 +515,9 @@ def create_cover_slide(
     Create the cover slide (Slide 1).
     Two-half layout: text on top half (dark bg), cover image on bottom half with gradient.
     """
-    img = Image.new("RGBA", SLIDE_SIZE, (*BG_COLOR, 255))
+    img = Image.new("RGB", SLIDE_SIZE, BG_COLOR)
     draw = ImageDraw.Draw(img)
+    runs = []
 
     # Logo
     paste_logo(img, draw, logo_path)
@@ -408,24 +546,25 @@ def create_cover_slide(
     for line in title_lines:
         lw = text_width(line, title_font)
         x = (SLIDE_WIDTH - lw) // 2
-        draw.text((x, y), line, fill=WHITE, font=title_font)
+        runs.append(((x, y), line, WHITE, title_font))
         y += line_height_title
 
     if subtext:
         y += 16
         sw = text_width(subtext, subtext_font)
         x = (SLIDE_WIDTH - sw) // 2
-        draw.text((x, y), subtext, fill=(255, 255, 255, 204), font=subtext_font)
+        runs.append(((x, y), subtext, (255, 255, 255, 204), subtext_font))
+
+    draw_text_runs(draw, runs)
 
     # Composite cover image into bottom half with gradient
     img = composite_bottom_image(img, cover_image_path)
-    draw = ImageDraw.Draw(img)
 
     # Swipe cue (drawn after image composite so it's on top)
     if show_swipe:
-        draw_swipe_cue(draw, SLIDE_WIDTH, SLIDE_HEIGHT)
+        draw_swipe_cue(img, SLIDE_WIDTH, SLIDE_HEIGHT)
 
-    return img.convert("RGB")
+    return img
 
 
 def content_area_top_half():
@@ -460,11 +599,12 @@ def create_content_slide(
     Create a content slide (headline + detail paragraph).
     Two-half layout: text on top, blog image on bottom with gradient.
     """
-    img = Image.new("RGBA", SLIDE_SIZE, (*BG_COLOR, 255))
+    img = Image.new("RGB", SLIDE_SIZE, BG_COLOR)
     draw = ImageDraw.Draw(img)
+    runs = []
 
     # Gradient strip at top
-    draw_gradient_strip(draw, 0, SLIDE_WIDTH)
+    draw_gradient_strip(img, 0, SLIDE_WIDTH)
 
     # Logo
     paste_logo(img, draw, logo_path)
@@ -508,7 +648,7 @@ def create_content_slide(
 
     # Draw headline
     for line in headline_lines:
-        draw.text((PADDING, y), line, fill=CYAN, font=headline_font)
+        runs.append(((PADDING, y), line, CYAN, headline_font))
         y += line_h_headline
 
     # Accent line below headline
@@ -522,21 +662,22 @@ def create_content_slide(
         for line in detail_lines:
             if y + line_h_detail > c_bottom:
                 break
-            draw.text((PADDING, y), line, fill=ZINC_300, font=detail_font)
+            runs.append(((PADDING, y), line, ZINC_300, detail_font))
             y += line_h_detail
 
+    draw_text_runs(draw, runs)
+
     # Composite blog image into bottom half
     img = composite_bottom_image(img, blog_image_path)
-    draw = ImageDraw.Draw(img)
 
     # Counter
-    draw_slide_counter(draw, slide_num, total_slides)
+    draw_slide_counter(img, slide_num, total_slides)
 
     # Swipe cue on slide 2
     if show_swipe:
-        draw_swipe_cue(draw, SLIDE_WIDTH, SLIDE_HEIGHT)
+        draw_swipe_cue(img, SLIDE_WIDTH, SLIDE_HEIGHT)
 
-    return img.convert("RGB")
+    return img
 
 
 def create_list_slide(
@@ -551,10 +692,11 @@ def create_list_slide(
     Create a list slide with numbered circles + items.
     Two-half layout: text on top, blog image on bottom with gradient.
     """
-    img = Image.new("RGBA", SLIDE_SIZE, (*BG_COLOR, 255))
+    img = Image.new("RGB", SLIDE_SIZE, BG_COLOR)
     draw = ImageDraw.Draw(img)
+    runs = []
 
-    draw_gradient_strip(draw, 0, SLIDE_WIDTH)
+    draw_gradient_strip(img, 0, SLIDE_WIDTH)
     paste_logo(img, draw, logo_path)
 
     headline_font = load_font(bold=True, size=CONTENT_HEADLINE_SIZE)
@@ -607,7 +749,7 @@ def create_list_slide(
 
     # Draw headline
     for line in headline_lines:
-        draw.text((PADDING, y), line, fill=CYAN, font=headline_font)
+        runs.append(((PADDING, y), line, CYAN, headline_font))
         y += line_h_headline
 
     # Accent line
@@ -627,18 +769,19 @@ def create_list_slide(
         for line in lines:
             if y + line_h_item > c_bottom:
                 break
-            draw.text((text_x, y), line, fill=WHITE, font=item_font)
+            runs.append(((text_x, y), line, WHITE, item_font))
             y += line_h_item
 
         y += item_gap
 
+    draw_text_runs(draw, runs)
+
     # Composite blog image into bottom half
     img = composite_bottom_image(img, blog_image_path)
-    draw = ImageDraw.Draw(img)
 
-    draw_slide_counter(draw, slide_num, total_slides)
+    draw_slide_counter(img, slide_num, total_slides)
 
-    return img.convert("RGB")
+    return img
 
 
 def create_stat_slide(
@@ -654,10 +797,11 @@ def create_stat_slide(
     Create a stat slide with a large number/metric + context.
     Two-half layout: text on top, blog image on bottom with gradient.
     """
-    img = Image.new("RGBA", SLIDE_SIZE, (*BG_COLOR, 255))
+    img = Image.new("RGB", SLIDE_SIZE, BG_COLOR)
     draw = ImageDraw.Draw(img)
+    runs = []
 
-    draw_gradient_strip(draw, 0, SLIDE_WIDTH)
+    draw_gradient_strip(img, 0, SLIDE_WIDTH)
     paste_logo(img, draw, logo_path)
 
     number_font = load_font(bold=True, size=STAT_NUMBER_SIZE)
@@ -704,7 +848,7 @@ def create_stat_slide(
 
     # Draw large number (centered)
     num_x = (SLIDE_WIDTH - num_w) // 2
-    draw.text((num_x, y), number, fill=CYAN, font=number_font)
+    runs.append(((num_x, y), number, CYAN, number_font))
     y += num_h + 30
 
     # Label (centered)
@@ -712,7 +856,7 @@ def create_stat_slide(
         for line in label_lines:
             lw = text_width(line, label_font)
             lx = (SLIDE_WIDTH - lw) // 2
-            draw.text((lx, y), line, fill=WHITE, font=label_font)
+            runs.append(((lx, y), line, WHITE, label_font))
             y += line_h_label
         y += 20
 
@@ -728,16 +872,17 @@ def create_stat_slide(
                 break
             lw = text_width(line, detail_font)
             lx = (SLIDE_WIDTH - lw) // 2
-            draw.text((lx, y), line, fill=ZINC_300, font=detail_font)
+            runs.append(((lx, y), line, ZINC_300, detail_font))
             y += line_h_detail
 
+    draw_text_runs(draw, runs)
+
     # Composite blog image into bottom half
     img = composite_bottom_image(img, blog_image_path)
-    draw = ImageDraw.Draw(img)
 
-    draw_slide_counter(draw, slide_num, total_slides)
+    draw_slide_counter(img, slide_num, total_slides)
 
-    return img.convert("RGB")
+    return img
 
 
 def create_quote_slide(
@@ -752,10 +897,11 @@ def create_quote_slide(
     Create a quote slide with large decorative quote marks.
     Two-half layout: text on top, blog image on bottom with gradient.
     """
-    img = Image.new("RGBA", SLIDE_SIZE, (*BG_COLOR, 255))
+    img = Image.new("RGB", SLIDE_SIZE, BG_COLOR)
     draw = ImageDraw.Draw(img)
+    runs = []
 
-    draw_gradient_strip(draw, 0, SLIDE_WIDTH)
+    draw_gradient_strip(img, 0, SLIDE_WIDTH)
     paste_logo(img, draw, logo_path)
 
     quote_font = load_font(bold=False, size=QUOTE_TEXT_SIZE)
@@ -792,13 +938,13 @@ def create_quote_slide(
     y = safe_start_y(c_top, c_bottom, total_h)
 
     # Opening quote mark (large, muted)
-    draw.text((PADDING, y), "\u201C", fill=ZINC_800, font=mark_font)
+    runs.append(((PADDING, y), "\u201C", ZINC_800, mark_font))
     y += mark_h + 20
 
     # Quote text (left-aligned with indent)
     quote_x = PADDING + 20
     for line in quote_lines:
-        draw.text((quote_x, y), line, fill=WHITE, font=quote_font)
+        runs.append(((quote_x, y), line, WHITE, quote_font))
         y += line_h_quote
 
     # Attribution
@@ -807,15 +953,16 @@ def create_quote_slide(
         # Accent line before attribution
         draw_accent_line(draw, quote_x, y)
         y += ACCENT_LINE_HEIGHT + 20
-        draw.text((quote_x, y), attribution, fill=ZINC_300, font=attr_font)
+        runs.append(((quote_x, y), attribution, ZINC_300, attr_font))
+
+    draw_text_runs(draw, runs)
 
     # Composite blog image into bottom half
     img = composite_bottom_image(img, blog_image_path)
-    draw = ImageDraw.Draw(img)
 
-    draw_slide_counter(draw, slide_num, total_slides)
+    draw_slide_counter(img, slide_num, total_slides)
 
-    return img.convert("RGB")
+    return img
 
 
 def create_cta_slide(
@@ -830,10 +977,11 @@ def create_cta_slide(
     Create a CTA (call-to-action) slide. Center-aligned, prominent branding.
     Two-half layout: text on top, blog image on bottom with gradient.
     """
-    img = Image.new("RGBA", SLIDE_SIZE, (*BG_COLOR, 255))
+    img = Image.new("RGB", SLIDE_SIZE, BG_COLOR)
     draw = ImageDraw.Draw(img)
+    runs = []
 
-    draw_gradient_strip(draw, 0, SLIDE_WIDTH)
+    draw_gradient_strip(img, 0, SLIDE_WIDTH)
 
     headline_font = load_font(bold=True, size=CTA_HEADLINE_SIZE)
     subtext_font = load_font(bold=False, size=CTA_SUBTEXT_SIZE)
@@ -863,8 +1011,7 @@ def create_cta_slide(
     y = c_top + (available - total_h) // 2
 
     # Large centered logo
-    logo_img = Image.open(logo_path).convert("RGBA")
-    logo_large = logo_img.resize((large_logo_size, large_logo_size), Image.LANCZOS)
+    logo_large = logo_icon(logo_path, large_logo_size)
     logo_x = (SLIDE_WIDTH - large_logo_size) // 2
     img.paste(logo_large, (logo_x, y), logo_large)
     y += large_logo_size + 40
@@ -873,7 +1020,7 @@ def create_cta_slide(
     for line in headline_lines:
         lw = text_width(line, headline_font)
         lx = (SLIDE_WIDTH - lw) // 2
-        draw.text((lx, y), line, fill=WHITE, font=headline_font)
+        runs.append(((lx, y), line, WHITE, headline_font))
         y += line_h_headline
 
     # Subtext
@@ -881,7 +1028,7 @@ def create_cta_slide(
         y += 20
         sw = text_width(subtext, subtext_font)
         sx = (SLIDE_WIDTH - sw) // 2
-        draw.text((sx, y), subtext, fill=CYAN, font=subtext_font)
+        runs.append(((sx, y), subtext, CYAN, subtext_font))
         y += line_h_sub
 
     # Accent line
@@ -894,31 +1041,43 @@ def create_cta_slide(
     if action:
         aw = text_width(action, action_font)
         ax = (SLIDE_WIDTH - aw) // 2
-        draw.text((ax, y), action, fill=ZINC_300, font=action_font)
+        runs.append(((ax, y), action, ZINC_300, action_font))
+
+    draw_text_runs(draw, runs)
 
     # Composite blog image into bottom half
     img = composite_bottom_image(img, blog_image_path)
-    draw = ImageDraw.Draw(img)
 
     # Counter
-    draw_slide_counter(draw, total_slides, total_slides)
+    draw_slide_counter(img, total_slides, total_slides)
 
     # Small logo in top-left too
-    small_logo = logo_img.resize((LOGO_ICON_SIZE, LOGO_ICON_SIZE), Image.LANCZOS)
-    img.paste(small_logo, (LOGO_PADDING, LOGO_PADDING), small_logo)
-    logo_text_font = load_font(bold=True, size=LOGO_TEXT_SIZE)
-    draw.text(
-        (LOGO_PADDING + LOGO_ICON_SIZE + LOGO_TEXT_GAP, LOGO_PADDING + (LOGO_ICON_SIZE - LOGO_TEXT_SIZE) // 2),
-        "augmi.world",
-        fill=WHITE,
-        font=logo_text_font,
-    )
+    paste_logo(img, draw, logo_path)
 
-    return img.convert("RGB")
+    return img
 
 
 # --- Markdown Parser ---
 
+# Markdown patterns, compiled once at import rather than per slide block
+_TITLE_RE = re.compile(r"^#\s+Instagram Carousel:\s*(.+)$", re.MULTILINE)
+_SECTION_SPLIT_RE = re.compile(r"\n---\n")
+_SLIDE_SPLIT_RE = re.compile(r"^##\s+Slide\s+\d+", re.MULTILINE)
+_TYPE_RE = re.compile(r"\s*\((\w+)\)")
+_TEXT_RE = re.compile(r"\*\*Text:\*\*\s*(.+)")
+_SUBTEXT_RE = re.compile(r"\*\*Subtext:\*\*\s*(.+)")
+_DETAIL_RE = re.compile(r"\*\*Detail:\*\*\s*(.+)")
+_ACTION_RE = re.compile(r"\*\*Action:\*\*\s*(.+)")
+_ITEMS_RE = re.compile(r"\*\*Items:\*\*\s*\n((?:\s*(?:\d+\.|-)\s+.+\n?)+)")
+_ITEM_RE = re.compile(r"(?:\d+\.|-)\s+(.+)")
+_NUMBER_RE = re.compile(r"\*\*Number:\*\*\s*(.+)")
+_QUOTE_RE = re.compile(r"\*\*Quote:\*\*\s*(.+)")
+_ATTR_RE = re.compile(r"\*\*Attribution:\*\*\s*(.+)")
+_CAPTION_HEADING_RE = re.compile(r"^##\s+Caption\s*\n")
+_HASHTAGS_RE = re.compile(r"^Hashtags:\s*(.+)")
+_PROMPT_HEADING_RE = re.compile(r"^##\s+Cover Image Prompt\s*\n")
+
+
 def parse_carousel_markdown(path: str) -> dict:
     """
     Parse instagram-carousel.md into structured data.
@@ -936,16 +1095,16 @@ def parse_carousel_markdown(path: str) -> dict:
     }
 
     # Extract title
-    title_match = re.search(r"^#\s+Instagram Carousel:\s*(.+)$", content, re.MULTILINE)
+    title_match = _TITLE_RE.search(content)
     if title_match:
         result["title"] = title_match.group(1).strip()
 
     # Split into sections by ---
-    sections = re.split(r"\n---\n", content)
+    sections = _SECTION_SPLIT_RE.split(content)
 
     # Parse slides from first section
     slides_section = sections[0] if sections else content
-    slide_blocks = re.split(r"^##\s+Slide\s+\d+", slides_section, flags=re.MULTILINE)
+    slide_blocks = _SLIDE_SPLIT_RE.split(slides_section)
 
     for block in slide_blocks[1:]:
         slide = {
@@ -961,7 +1120,7 @@ def parse_carousel_markdown(path: str) -> dict:
         }
 
         # Detect slide type from annotation like (Cover), (List), (Stat), (Quote), (CTA), (Final)
-        type_match = re.match(r"\s*\((\w+)\)", block)
+        type_match = _TYPE_RE.match(block)
         if type_match:
             type_label = type_match.group(1).lower()
             if type_label in ("cover",):
@@ -977,44 +1136,44 @@ def parse_carousel_markdown(path: str) -> dict:
             block = block[type_match.end():]
 
         # Parse fields
-        text_match = re.search(r"\*\*Text:\*\*\s*(.+)", block)
+        text_match = _TEXT_RE.search(block)
         if text_match:
             slide["text"] = text_match.group(1).strip()
 
-        subtext_match = re.search(r"\*\*Subtext:\*\*\s*(.+)", block)
+        subtext_match = _SUBTEXT_RE.search(block)
         if subtext_match:
             slide["subtext"] = subtext_match.group(1).strip()
 
-        detail_match = re.search(r"\*\*Detail:\*\*\s*(.+)", block)
+        detail_match = _DETAIL_RE.search(block)
         if detail_match:
             slide["detail"] = detail_match.group(1).strip()
 
-        action_match = re.search(r"\*\*Action:\*\*\s*(.+)", block)
+        action_match = _ACTION_RE.search(block)
         if action_match:
             slide["action"] = action_match.group(1).strip()
 
         # List items (numbered: 1. ... 2. ... or - ...)
-        items_section = re.search(r"\*\*Items:\*\*\s*\n((?:\s*(?:\d+\.|-)\s+.+\n?)+)", block)
+        items_section = _ITEMS_RE.search(block)
         if items_section:
             slide["type"] = "list"
             items_text = items_section.group(1)
-            items = re.findall(r"(?:\d+\.|-)\s+(.+)", items_text)
+            items = _ITEM_RE.findall(items_text)
             slide["items"] = [item.strip() for item in items]
 
         # Stat number
-        number_match = re.search(r"\*\*Number:\*\*\s*(.+)", block)
+        number_match = _NUMBER_RE.search(block)
         if number_match:
             slide["type"] = "stat"
             slide["number"] = number_match.group(1).strip()
 
         # Quote
-        quote_match = re.search(r"\*\*Quote:\*\*\s*(.+)", block)
+        quote_match = _QUOTE_RE.search(block)
         if quote_match:
             slide["type"] = "quote"
             slide["quote"] = quote_match.group(1).strip().strip('"').strip('\u201c').strip('\u201d')
 
         # Attribution
-        attr_match = re.search(r"\*\*Attribution:\*\*\s*(.+)", block)
+        attr_match = _ATTR_RE.search(block)
         if attr_match:
             slide["attribution"] = attr_match.group(1).strip()
 
@@ -1023,11 +1182,11 @@ def parse_carousel_markdown(path: str) -> dict:
     # Parse caption section
     if len(sections) > 1:
         caption_section = sections[1]
-        caption_text = re.sub(r"^##\s+Caption\s*\n", "", caption_section.strip())
+        caption_text = _CAPTION_HEADING_RE.sub("", caption_section.strip())
         lines = caption_text.strip().split("\n")
         caption_lines = []
         for line in lines:
-            hashtag_match = re.match(r"^Hashtags:\s*(.+)", line)
+            hashtag_match = _HASHTAGS_RE.match(line)
             if hashtag_match:
                 result["hashtags"] = hashtag_match.group(1).strip()
             else:
@@ -1037,7 +1196,7 @@ def parse_carousel_markdown(path: str) -> dict:
     # Parse image prompt section
     if len(sections) > 2:
         prompt_section = sections[2]
-        prompt_text = re.sub(r"^##\s+Cover Image Prompt\s*\n", "", prompt_section.strip())
+        prompt_text = _PROMPT_HEADING_RE.sub("", prompt_section.strip())
         result["image_prompt"] = prompt_text.strip()
 
     return result
@@ -1045,6 +1204,30 @@ def parse_carousel_markdown(path: str) -> dict:
 
 # --- Main Generator ---
 
+SLIDE_CREATORS = {
+    "cover": create_cover_slide,
+    "content": create_content_slide,
+    "list": create_list_slide,
+    "stat": create_stat_slide,
+    "quote": create_quote_slide,
+    "cta": create_cta_slide,
+}
+
+
+def render_slide(task: tuple[str, dict, str, str]) -> str:
+    """
+    Render one slide and save it in the requested output format.
+
+    Takes a (slide_type, kwargs, output_path, output_format) tuple so it can
+    run in a worker process; returns the output path.
+    """
+    slide_type, kwargs, slide_path, output_format = task
+    img = SLIDE_CREATORS[slide_type](**kwargs)
+    fmt, save_options = OUTPUT_FORMATS[output_format]
+    img.save(slide_path, fmt, **save_options)
+    return slide_path
+
+
 def load_blog_images(blog_images_dir: str) -> list[str]:
     """Load blog image paths from a directory, sorted by filename."""
     if not blog_images_dir or not os.path.isdir(blog_images_dir):
@@ -1063,8 +1246,15 @@ def generate_carousel(
     output_dir: str,
     logo_path: str,
     blog_images_dir: str = None,
+    workers: int = None,
+    output_format: str = DEFAULT_OUTPUT_FORMAT,
 ):
-    """Generate all carousel slides and caption file."""
+    """
+    Generate all carousel slides and caption file.
+
+    Slides are rendered in up to `workers` processes (default: one per CPU;
+    1 renders in this process) and saved as `output_format` (png or jpg).
+    """
     data = parse_carousel_markdown(markdown_path)
     slides = data["slides"]
 
@@ -1085,6 +1275,9 @@ def generate_carousel(
 
     os.makedirs(output_dir, exist_ok=True)
 
+    # Describe every slide first; rendering is CPU-bound and slides are
+    # independent, so they are then rendered in parallel worker processes
+    tasks = []
     for i, slide in enumerate(slides):
         slide_num = i + 1
         slide_type = slide["type"]
@@ -1099,10 +1292,8 @@ def generate_carousel(
         elif slide_num == total_slides and slide_type == "content" and slide.get("action"):
             slide_type = "cta"
 
-        print(f"Generating slide {slide_num}/{total_slides} ({slide_type})...")
-
         if slide_type == "cover":
-            img = create_cover_slide(
+            kwargs = dict(
                 cover_image_path=cover_image_path,
                 title=slide["text"],
                 subtext=slide.get("subtext", ""),
@@ -1110,7 +1301,7 @@ def generate_carousel(
                 show_swipe=(total_slides > 1),
             )
         elif slide_type == "list":
-            img = create_list_slide(
+            kwargs = dict(
                 headline=slide["text"],
                 items=slide["items"] if slide["items"] else [slide["detail"]],
                 slide_num=slide_num,
@@ -1119,7 +1310,7 @@ def generate_carousel(
                 blog_image_path=blog_img_path,
             )
         elif slide_type == "stat":
-            img = create_stat_slide(
+            kwargs = dict(
                 number=slide["number"] or slide["text"],
                 label=slide["text"] if slide["number"] else "",
                 detail=slide["detail"] or slide["subtext"],
@@ -1129,7 +1320,7 @@ def generate_carousel(
                 blog_image_path=blog_img_path,
             )
         elif slide_type == "quote":
-            img = create_quote_slide(
+            kwargs = dict(
                 quote=slide["quote"] or slide["text"],
                 attribution=slide["attribution"] or slide["subtext"],
                 slide_num=slide_num,
@@ -1138,7 +1329,7 @@ def generate_carousel(
                 blog_image_path=blog_img_path,
             )
         elif slide_type == "cta":
-            img = create_cta_slide(
+            kwargs = dict(
                 headline=slide["text"],
                 subtext=slide.get("subtext", ""),
                 action=slide.get("action", ""),
@@ -1148,7 +1339,8 @@ def generate_carousel(
             )
         else:
             # Default: content slide
-            img = create_content_slide(
+            slide_type = "content"
+            kwargs = dict(
                 headline=slide["text"],
                 detail=slide["detail"] or slide["subtext"] or slide["action"],
                 slide_num=slide_num,
@@ -1158,9 +1350,18 @@ def generate_carousel(
                 blog_image_path=blog_img_path,
             )
 
-        slide_path = os.path.join(output_dir, f"slide-{slide_num:02d}.png")
-        img.save(slide_path, "PNG", quality=95)
-        print(f"  Saved: {slide_path}")
+        print(f"Generating slide {slide_num}/{total_slides} ({slide_type})...")
+        slide_path = os.path.join(output_dir, f"slide-{slide_num:02d}.{output_format}")
+        tasks.append((slide_type, kwargs, slide_path, output_format))
+
+    workers = min(workers or os.cpu_count() or 1, total_slides)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for slide_path in executor.map(render_slide, tasks):
+                print(f"  Saved: {slide_path}")
+    else:
+        for task in tasks:
+            print(f"  Saved: {render_slide(task)}")
 
     # Save caption
     caption_parts = []
@@ -1207,9 +1408,24 @@ def main():
         default=None,
         help="Directory of blog images for bottom-half compositing (enables two-half layout)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes used to render slides (default: one per CPU; 1 disables parallelism)",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=sorted(OUTPUT_FORMATS),
+        default=DEFAULT_OUTPUT_FORMAT,
+        help=f"Slide image format (default: {DEFAULT_OUTPUT_FORMAT}; jpg is smaller and faster to encode)",
+    )
 
     args = parser.parse_args()
 
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+
     ensure_fonts()
     if args.logo == str(DEFAULT_LOGO):
         ensure_logo()
@@ -1230,6 +1446,8 @@ def main():
         output_dir=args.output_dir,
         logo_path=args.logo,
         blog_images_dir=args.blog_images_dir,
+        workers=args.workers,
+        output_format=args.output_format,
     )
 
 